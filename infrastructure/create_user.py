@@ -4,6 +4,10 @@ Script para criar um novo usuário no banco de dados.
 
 Uso:
     python -m scripts.create_user --email email@exemplo.com --notes_path /caminho/para/notas
+    python -m scripts.create_user --emails-file usuarios.txt
+
+O arquivo de emails tem um usuário por linha, no formato `email` ou
+`email,caminho_das_notas`. Linhas vazias e iniciadas por `#` são ignoradas.
 """
 import argparse
 import sys
@@ -12,6 +16,13 @@ import os
 # Adiciona o diretório raiz ao path para permitir importações
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Script de execução única: não mantém conexões abertas em um pool
+os.environ.setdefault("DB_DISABLE_POOL", "1")
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert, select
+
 from database.database import SessionLocal, init_db
 from database.models import Account
 
@@ -26,38 +37,96 @@ def create_user(email: str, notes_path: str = None) -> Account:
     Returns:
         Account: O objeto Account criado
     """
-    db = SessionLocal()
-    try:
-        # Verifica se o usuário já existe
-        existing_user = db.query(Account).filter(Account.email == email).first()
-        if existing_user:
-            print(f"Erro: Já existe um usuário com o email {email}")
+    with SessionLocal() as db:
+        try:
+            # Verifica se o usuário já existe
+            existing_user = db.execute(
+                select(Account).where(Account.email == email)
+            ).scalar_one_or_none()
+            if existing_user:
+                print(f"Erro: Já existe um usuário com o email {email}")
+                return None
+            
+            # Cria o novo usuário
+            new_user = Account(
+                email=email,
+                notes_path=notes_path
+            )
+            
+            db.add(new_user)
+            db.commit()
+            db.refresh(new_user)
+            
+            print(f"Usuário criado com sucesso! ID: {new_user.id}, Email: {new_user.email}")
+            return new_user
+            
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao criar usuário: {e}")
             return None
+
+def read_emails_file(path: str) -> Dict[str, Optional[str]]:
+    """
+    Lê o arquivo de usuários, removendo emails duplicados.
+    
+    Args:
+        path: Caminho do arquivo com um `email[,caminho_das_notas]` por linha
         
-        # Cria o novo usuário
-        new_user = Account(
-            email=email,
-            notes_path=notes_path
-        )
-        
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        
-        print(f"Usuário criado com sucesso! ID: {new_user.id}, Email: {new_user.email}")
-        return new_user
+    Returns:
+        Dict[str, Optional[str]]: Email -> caminho das notas, na ordem do arquivo
+    """
+    users: Dict[str, Optional[str]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            email, _, notes_path = line.partition(",")
+            users.setdefault(email.strip(), notes_path.strip() or None)
+    return users
+
+def create_users(users: Dict[str, Optional[str]]) -> List[str]:
+    """
+    Cria vários usuários com um único INSERT em lote.
+    
+    Args:
+        users: Email -> caminho das notas (opcional) de cada usuário
         
-    except Exception as e:
-        db.rollback()
-        print(f"Erro ao criar usuário: {e}")
-        return None
-    finally:
-        db.close()
+    Returns:
+        List[str]: Emails dos usuários efetivamente criados
+    """
+    with SessionLocal() as db:
+        try:
+            # Uma única consulta para descobrir quem já existe
+            existing = set(db.execute(
+                select(Account.email).where(Account.email.in_(list(users)))
+            ).scalars())
+            for email in existing:
+                print(f"Aviso: Já existe um usuário com o email {email}")
+            
+            rows = [
+                {"email": email, "notes_path": notes_path}
+                for email, notes_path in users.items()
+                if email not in existing
+            ]
+            if rows:
+                db.execute(insert(Account), rows)
+                db.commit()
+            
+            print(f"{len(rows)} usuário(s) criado(s) com sucesso!")
+            return [row["email"] for row in rows]
+            
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao criar usuários: {e}")
+            return []
 
 def main():
     # Configura o parser de argumentos
     parser = argparse.ArgumentParser(description='Cria um novo usuário no banco de dados')
-    parser.add_argument('--email', type=str, required=True, help='Email do usuário')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--email', type=str, help='Email do usuário')
+    source.add_argument('--emails-file', type=str, help='Arquivo com um `email[,caminho_das_notas]` por linha')
     parser.add_argument('--notes_path', type=str, help='Caminho para as notas do usuário (opcional)')
     
     args = parser.parse_args()
@@ -65,6 +134,11 @@ def main():
     # Inicializa o banco de dados
     init_db()
     
+    if args.emails_file:
+        # Cria todos os usuários do arquivo de uma vez
+        create_users(read_emails_file(args.emails_file))
+        return
+    
     # Cria o usuário
     user = create_user(args.email, args.notes_path)
     
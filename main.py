@@ -11,9 +11,17 @@ if str(CLI_DIR) not in sys.path:
 
 import app  # noqa: E402
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 
 def main() -> None:
-    asyncio.run(app.main())
+    if uvloop is not None:
+        uvloop.run(app.main())
+    else:
+        asyncio.run(app.main())
 
 
 if __name__ == "__main__":
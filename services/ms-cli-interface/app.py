@@ -4,41 +4,115 @@ CLI Interface for Samantha - Your Personal Assistant
 """
 import argparse
 import asyncio
+import functools
 import random
+import re
 import signal
-import uuid
-from typing import Dict, Any, Optional
-
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import InMemoryHistory
-from prompt_toolkit.key_binding import KeyBindings
-from rich import print
-from rich.console import Console
-from rich.panel import Panel
-from rich.status import Status
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from secrets import token_hex
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
 
 # Local imports
 from src.nlp_client import NLPClient
 from src.config import config
 
-# Initialize console
-console = Console()
+# Rich and prompt_toolkit are imported inside SamanthaCLI so that `--help`
+# and plain module imports don't pay their start-up cost.
+if TYPE_CHECKING:
+    from prompt_toolkit.key_binding import KeyBindings
+
+# Commands that end the chat; inputs longer than the longest one skip lowercasing
+_EXIT_CMDS = frozenset({"sair", "exit", "quit"})
+_MAX_EXIT_LEN = max(map(len, _EXIT_CMDS))
+
+# CSI-u encoding of Enter with modifiers: ESC [ 13 ; <modifier> [; ...] u
+_CSI_U_ENTER_RE = re.compile(r"\A\x1b\[13;(\d+)(?:;[^u]*)?u\Z")
+_SHIFT_FLAG = 1
+
+# Prompt history survives between sessions so recall and auto-suggest have context
+_HISTORY_FILE = Path.home() / ".samantha_history"
+
+# Upper bound for the optional (--cache) response cache
+_RESPONSE_CACHE_SIZE = 128
+
+# Braille frames for the "thinking" spinner, written straight to stdout
+_SPINNER_FRAMES = ("⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏")
+_SPINNER_INTERVAL = 0.1
+
+
+async def _spinner(msg: str) -> None:
+    """Animate a single-line spinner until the task is cancelled."""
+    frame = 0
+    try:
+        while True:
+            sys.stdout.write("\r" + _SPINNER_FRAMES[frame] + " " + msg)
+            sys.stdout.flush()
+            frame = (frame + 1) % len(_SPINNER_FRAMES)
+            await asyncio.sleep(_SPINNER_INTERVAL)
+    finally:
+        # Erase the spinner line so the next output starts clean
+        sys.stdout.write("\r" + " " * (len(msg) + 2) + "\r")
+        sys.stdout.flush()
+
+
+@functools.lru_cache(maxsize=None)
+def _welcome_panel():
+    """Build the welcome panel once; rich.panel is only imported when it is shown."""
+    from rich.panel import Panel
+
+    return Panel.fit(
+        "[bold blue]🌟 Bem-vindo ao Samantha! 🌟[/]\n\n"
+        "[italic]Seu assistente pessoal inteligente.[/]\n"
+        "Digite 'sair' para encerrar o chat.",
+        title=f"{config.app_name} v{config.app_version}",
+        border_style="blue",
+        padding=(1, 2)
+    )
 
 
 class SamanthaCLI:
     """Main CLI application for Samantha."""
 
-    def __init__(self, email: Optional[str] = None, access_token: Optional[str] = None):
+    def __init__(
+        self,
+        email: Optional[str] = None,
+        access_token: Optional[str] = None,
+        history_enabled: bool = True,
+        max_thread_turns: int = config.cli_thread_max_turns,
+        cache_responses: bool = False
+    ):
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+        from prompt_toolkit.history import FileHistory
+        from rich.console import Console
+        from rich.text import Text
+
+        self.console = Console()
         self.nlp_client = NLPClient(
-            base_url=config.get_nlp_service_url(),
-            access_token=access_token
+            base_url=config.nlp_service_url,
+            access_token=access_token,
+            email=email
         )
         self.running = True
         self.email = email
-        self.history = InMemoryHistory()
+        self.history = FileHistory(str(_HISTORY_FILE))
         self.key_bindings = self._create_key_bindings()
-        self.session = PromptSession(history=self.history, key_bindings=self.key_bindings)
+        self.session = PromptSession(
+            history=self.history,
+            auto_suggest=AutoSuggestFromHistory(),
+            key_bindings=self.key_bindings
+        )
         self.thread_id = self._generate_thread_id()
+        self.history_enabled = history_enabled
+        self.max_thread_turns = max_thread_turns
+        self._thread_turns = 0
+        self._samantha_prefix = Text("Samantha: ", style="bold magenta")
+        # LRU of (thread_id, user_input) -> response, only populated with --cache
+        self._response_cache: Optional["OrderedDict[Tuple[str, str], str]"] = (
+            OrderedDict() if cache_responses else None
+        )
 
         # Register signal handler for graceful shutdown
         signal.signal(signal.SIGINT, self._handle_interrupt)
@@ -47,52 +121,61 @@ class SamanthaCLI:
     def _handle_interrupt(self, signum, frame):
         """Handle interrupt signals for graceful shutdown."""
         self.running = False
-        console.print("\n[red]chat ecerrado[/]")
+        self.console.print("\n[red]chat ecerrado[/]")
     
     def display_welcome(self):
         """Display welcome message"""
-        console.print(
-            Panel.fit(
-                "[bold blue]🌟 Bem-vindo ao Samantha! 🌟[/]\n\n"
-                "[italic]Seu assistente pessoal inteligente.[/]\n"
-                "Digite 'sair' para encerrar o chat.",
-                title=f"{config.get_app_name()} v{config.get_app_version()}",
-                border_style="blue",
-                padding=(1, 2)
-            )
-        )
+        self.console.print(_welcome_panel())
     
     async def process_input(self, user_input: str) -> str:
         """Process user input using the NLP service."""
+        cache_key = (self.thread_id if self.history_enabled else "", user_input)
+        if self._response_cache is not None and cache_key in self._response_cache:
+            self._response_cache.move_to_end(cache_key)
+            return self._response_cache[cache_key]
+
         try:
-            with Status("Pensando...", spinner="dots"):
+            spinner = asyncio.create_task(_spinner("Pensando..."))
+            try:
                 response = await self.nlp_client.process_text(
                     user_input,
-                    self.email,
-                    thread_id=self.thread_id
+                    thread_id=self.thread_id if self.history_enabled else self._generate_thread_id(),
+                    history=self.history_enabled
                 )
+            finally:
+                spinner.cancel()
+                await asyncio.gather(spinner, return_exceptions=True)
                 
-                # Check if authentication is required
-                if response.get("requires_auth", False):
-                    console.print(f"\n[red]⚠️ {response.get('response', 'Erro de autenticação')}[/]")
-                    console.print("\nPor favor, faça login novamente para continuar.")
-                    console.print("Execute o comando a seguir para obter um novo token:")
-                    console.print("  [bold]curl http://localhost:8080/test-token/seu-email@exemplo.com[/]")
-                    console.print("E depois execute o cliente com o novo token:")
-                    console.print(f"  [bold]python -m app --email seu-email@exemplo.com --token SEU_TOKEN_AQUI[/]\n")
-                    self.running = False
-                    return ""
-                    
-                return response.get("response", "Desculpe, não consegui processar sua mensagem.")
+            # Check if authentication is required
+            if response.get("requires_auth", False):
+                self.console.print(f"\n[red]⚠️ {response.get('response', 'Erro de autenticação')}[/]")
+                self.console.print("\nPor favor, faça login novamente para continuar.")
+                self.console.print("Execute o comando a seguir para obter um novo token:")
+                self.console.print("  [bold]curl http://localhost:8080/test-token/seu-email@exemplo.com[/]")
+                self.console.print("E depois execute o cliente com o novo token:")
+                self.console.print(f"  [bold]python -m app --email seu-email@exemplo.com --token SEU_TOKEN_AQUI[/]\n")
+                self.running = False
+                return ""
+                
+            text = response.get("response", "Desculpe, não consegui processar sua mensagem.")
+            # Errors come back from the "system" agent and must not be replayed
+            if self._response_cache is not None and response.get("agent") != "system":
+                self._response_cache[cache_key] = text
+                if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
+            return text
                 
         except Exception as e:
-            console.print(f"\n[red]Erro ao processar mensagem: {e}[/]")
+            self.console.print(f"\n[red]Erro ao processar mensagem: {e}[/]")
             return "Ocorreu um erro ao processar sua mensagem. Por favor, tente novamente."
     
     async def run(self):
         """Run the CLI application."""
         self.display_welcome()
-        console.print(f"[dim]Thread atual: {self.thread_id}[/]")
+        if self.history_enabled:
+            self.console.print(f"[dim]Thread atual: {self.thread_id}[/]")
+        else:
+            self.console.print("[dim]Histórico desativado: cada mensagem é enviada sem contexto.[/]")
         
         while self.running:
             try:
@@ -100,23 +183,28 @@ class SamanthaCLI:
                 user_input = await self.session.prompt_async("\nVocê: ")
                 
                 # Check for exit command
-                if user_input.lower() in ('sair', 'exit', 'quit'):
+                if len(user_input) <= _MAX_EXIT_LEN and user_input.lower() in _EXIT_CMDS:
                     self.running = False
-                    console.print("\n[blue]Até logo! Estarei aqui se precisar de mais algo. 😊[/]")
+                    self.console.print("\n[blue]Até logo! Estarei aqui se precisar de mais algo. 😊[/]")
                     break
                 
                 # Process the input and get response
                 response = await self.process_input(user_input)
                 
                 # Display Samantha's response
-                console.print(f"\n[bold magenta]Samantha:[/] {response}")
+                self.console.print("\n", self._samantha_prefix, response, sep="", markup=False)
+
+                # Keep server-side history bounded by rotating long threads
+                self._thread_turns += 1
+                if self.history_enabled and self.max_thread_turns and self._thread_turns >= self.max_thread_turns:
+                    self._start_new_thread()
                 
             except KeyboardInterrupt:
                 self.running = False
-                console.print("\n\n[red]Encerrando o chat...[/]")
+                self.console.print("\n\n[red]Encerrando o chat...[/]")
                 break
             except Exception as e:
-                console.print(f"\n[red]Ocorreu um erro: {e}[/]")
+                self.console.print(f"\n[red]Ocorreu um erro: {e}[/]")
                 continue
             
     async def close(self):
@@ -125,19 +213,22 @@ class SamanthaCLI:
 
     def _generate_thread_id(self) -> str:
         """Generate a short unique thread identifier."""
-        return uuid.uuid4().hex[:8]
+        return token_hex(4)
 
     def _start_new_thread(self):
         """Reset the conversation thread and notify the user."""
         previous_thread = self.thread_id
         self.thread_id = self._generate_thread_id()
-        console.print(
+        self._thread_turns = 0
+        self.console.print(
             f"\n[cyan]🔁 Nova thread iniciada[/] "
             f"(anterior: {previous_thread} → atual: {self.thread_id})"
         )
 
-    def _create_key_bindings(self) -> KeyBindings:
+    def _create_key_bindings(self) -> "KeyBindings":
         """Configure custom key bindings for the CLI session."""
+        from prompt_toolkit.key_binding import KeyBindings
+
         kb = KeyBindings()
 
         @kb.add("enter")
@@ -162,38 +253,38 @@ class SamanthaCLI:
         if not event.key_sequence:
             return False
 
-        last_key = event.key_sequence[-1]
-        data = getattr(last_key, "data", "") or ""
-
-        # Check for CSI u format: ESC [ <keycode> ; <modifier> u
-        if data.startswith("\x1b[") and data.endswith("u"):
-            payload = data[2:-1]
-            parts = payload.split(";")
-
-            if len(parts) >= 2 and parts[0] == "13":  # 13 == Enter
-                try:
-                    modifier = int(parts[1])
-                except ValueError:
-                    return False
+        data = getattr(event.key_sequence[-1], "data", "") or ""
+        match = _CSI_U_ENTER_RE.match(data)
+        if not match:
+            return False
 
-                # Modifier encoding follows xterm: 1 (base) + bitmask
-                # Shift flag is the first bit.
-                shift_flag = 1  # after subtracting base (1)
-                effective = max(modifier - 1, 0)
-                return (effective & shift_flag) == shift_flag
+        # Modifier encoding follows xterm: 1 (base) + bitmask, Shift is the first bit
+        effective = max(int(match.group(1)) - 1, 0)
+        return (effective & _SHIFT_FLAG) == _SHIFT_FLAG
 
-        return False
 
 async def main():
     """Main entry point for the application."""
     parser = argparse.ArgumentParser(description="Samantha - Your Personal Assistant")
     parser.add_argument("--email", type=str, help="Email for authentication")
     parser.add_argument("--token", type=str, help="Access token for authentication")
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Send every message without previous conversation context"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse the previous answer when the same message is repeated in a thread"
+    )
     args = parser.parse_args()
 
     cli = SamanthaCLI(
         email=args.email,
-        access_token=args.token
+        access_token=args.token,
+        history_enabled=not args.no_history,
+        cache_responses=args.cache
     )
     try:
         await cli.run()
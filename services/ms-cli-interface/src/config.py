@@ -3,67 +3,41 @@ Configuration module for Samantha CLI.
 Loads settings from environment variables and .env files.
 """
 import os
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+
+def _env(name: str, default: str, cast: Callable[[str], Any] = str) -> Any:
+    """Build a dataclass default that reads (and casts) an environment variable."""
+    return field(default_factory=lambda: cast(os.environ.get(name, default)))
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
     """Configuration class for Samantha CLI."""
-    
+
     # NLP Service Configuration
-    NLP_SERVICE_URL: str = os.getenv(
-        "NLP_SERVICE_URL", 
-        "http://localhost:8080"
-    )
-    
+    nlp_service_url: str = _env("NLP_SERVICE_URL", "http://localhost:8080")
+
+    # Connection pool configuration for the NLP service client
+    nlp_pool_max_connections: int = _env("NLP_POOL_MAX_CONNECTIONS", "100", int)
+    nlp_pool_keepalive: int = _env("NLP_POOL_KEEPALIVE", "20", int)
+
     # CLI Configuration
-    CLI_TIMEOUT: float = float(os.getenv(
-        "CLI_TIMEOUT", 
-        "30.0"
-    ))
-    
-    CLI_LOG_LEVEL: str = os.getenv(
-        "CLI_LOG_LEVEL", 
-        "INFO"
-    )
-    
+    cli_timeout: float = _env("CLI_TIMEOUT", "30.0", float)
+    cli_log_level: str = _env("CLI_LOG_LEVEL", "INFO")
+
+    # Start a fresh conversation thread after this many turns (0 disables rotation)
+    cli_thread_max_turns: int = _env("CLI_THREAD_MAX_TURNS", "0", int)
+
     # Application Configuration
-    APP_NAME: str = os.getenv(
-        "APP_NAME", 
-        "Samantha CLI"
-    )
-    
-    APP_VERSION: str = os.getenv(
-        "APP_VERSION", 
-        "1.0.0"
-    )
-    
-    @classmethod
-    def get_nlp_service_url(cls) -> str:
-        """Get the NLP service URL."""
-        return cls.NLP_SERVICE_URL
-    
-    @classmethod
-    def get_cli_timeout(cls) -> float:
-        """Get the CLI timeout in seconds."""
-        return cls.CLI_TIMEOUT
-    
-    @classmethod
-    def get_cli_log_level(cls) -> str:
-        """Get the CLI log level."""
-        return cls.CLI_LOG_LEVEL
-    
-    @classmethod
-    def get_app_name(cls) -> str:
-        """Get the application name."""
-        return cls.APP_NAME
-    
-    @classmethod
-    def get_app_version(cls) -> str:
-        """Get the application version."""
-        return cls.APP_VERSION
+    app_name: str = _env("APP_NAME", "Samantha CLI")
+    app_version: str = _env("APP_VERSION", "1.0.0")
+
 
 # Global configuration instance
 config = Config()
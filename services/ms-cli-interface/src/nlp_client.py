@@ -1,121 +1,338 @@
 """
 Client for interacting with the NLP Processor service.
 """
+import asyncio
+import time
 import httpx
-from typing import Dict, Any, Optional
+import orjson
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 import logging
 from .config import config
 
 logger = logging.getLogger(__name__)
 
+# Pooled HTTP clients shared by every NLPClient in the process, keyed by base URL
+# and default headers so clients authenticated as different users never mix
+_ClientKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+_shared_clients: Dict[_ClientKey, httpx.AsyncClient] = {}
+# Number of open NLPClients using each pooled client; it is closed when this drops to zero
+_shared_refs: Dict[_ClientKey, int] = {}
+
+
+def _get_shared_client(key: _ClientKey, timeout: float) -> httpx.AsyncClient:
+    """Return the pooled HTTP/2 client for key, creating it on first use."""
+    client = _shared_clients.get(key)
+    if client is None or client.is_closed:
+        # Limits and HTTP/2 live on the transport: httpx ignores the client-level
+        # arguments once an explicit transport is given.
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=config.nlp_pool_max_connections,
+                max_keepalive_connections=config.nlp_pool_keepalive,
+                keepalive_expiry=30,
+            ),
+            retries=2,
+        )
+        base_url, headers = key
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=dict(headers),
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            transport=transport,
+        )
+        _shared_clients[key] = client
+    return client
+
+
+_NO_HEADERS: Dict[str, str] = {}
+
+# User-facing messages for HTTP errors returned by the NLP service
+_STATUS_MESSAGES: Dict[int, str] = {
+    401: "Token de acesso inválido ou expirado. Por favor, faça login novamente.",
+    403: "Acesso negado. Verifique suas credenciais e tente novamente.",
+    422: "Dados inválidos na requisição.",
+}
+_AUTH_STATUS = frozenset({401, 403})
+
+# Called after every process_text with the result and the elapsed time in ms
+ResponseHook = Callable[[Dict[str, Any], float], None]
+
+
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds since a time.perf_counter() reading."""
+    return (time.perf_counter() - start) * 1000
+
+
+class _MicroBatcher:
+    """
+    Coalesce concurrent /process calls into a single /process_batch request.
+    
+    A payload that arrives alone is sent right away. When others are already
+    queued with it, the batch keeps collecting for up to batch_wait_timeout_s
+    (and max_batch_size) and is sent together, each caller's future receiving
+    its own result. Servers without /process_batch fall back to parallel
+    /process calls.
+    """
+    
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_batch_size: int = 16,
+        batch_wait_timeout_s: float = 0.005
+    ):
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self._batch_supported = True
+    
+    async def submit(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+        """Queue a payload for the next batch and wait for its response."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, headers, future))
+        return await future
+    
+    async def _run(self) -> None:
+        """Drain the queue into batches and dispatch them without blocking the next one."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            # A lone interactive call shouldn't pay the batching window
+            deadline = loop.time() + self.batch_wait_timeout_s
+            while 1 < len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Only payloads sharing the same auth headers can travel together
+            groups: Dict[Tuple[Tuple[str, str], ...], List[tuple]] = {}
+            for item in batch:
+                groups.setdefault(tuple(sorted(item[1].items())), []).append(item)
+            
+            for items in groups.values():
+                task = asyncio.create_task(self._dispatch(items))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+    
+    async def _dispatch(self, items: List[tuple]) -> None:
+        """Send one group of payloads and resolve their futures."""
+        payloads = [payload for payload, _, _ in items]
+        headers = items[0][1]
+        try:
+            if len(payloads) > 1 and self._batch_supported:
+                results = await self._post_batch(payloads, headers)
+            else:
+                results = await self._post_each(payloads, headers)
+        except Exception as e:
+            results = [e] * len(items)
+        
+        for (_, _, future), result in zip(items, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def _post_one(self, payload: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+        response = await self.client.post("/process", content=orjson.dumps(payload), headers=headers)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def _post_each(self, payloads: List[Dict[str, Any]], headers: Dict[str, str]) -> List[Any]:
+        return await asyncio.gather(
+            *(self._post_one(payload, headers) for payload in payloads),
+            return_exceptions=True
+        )
+    
+    async def _post_batch(self, payloads: List[Dict[str, Any]], headers: Dict[str, str]) -> List[Any]:
+        response = await self.client.post(
+            "/process_batch",
+            content=orjson.dumps({"items": payloads}),
+            headers=headers
+        )
+        if response.status_code == 404:
+            logger.info("NLP service has no /process_batch endpoint, sending requests individually")
+            self._batch_supported = False
+            return await self._post_each(payloads, headers)
+        response.raise_for_status()
+        return orjson.loads(response.content)["results"]
+    
+    async def close(self) -> None:
+        """Stop the background worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+
 class NLPClient:
     """Client for the NLP Processor service."""
     
-    def __init__(self, base_url: Optional[str] = None, access_token: Optional[str] = None):
-        self.base_url = (base_url or config.get_nlp_service_url()).rstrip('/')
-        self.client = httpx.AsyncClient()
-        self.timeout = config.get_cli_timeout()
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        access_token: Optional[str] = None,
+        email: Optional[str] = None,
+        on_response: Optional[ResponseHook] = None
+    ):
+        self.base_url = (base_url or config.nlp_service_url).rstrip('/')
+        self.timeout = config.cli_timeout
         self.access_token = access_token
+        self.email = email
+        # Lets callers plug in metrics (e.g. a latency histogram) without touching this module
+        self.on_response = on_response
+
+        # Auth data is constant for the client's lifetime, so it rides on the
+        # HTTP client's default headers instead of being rebuilt per request.
+        # Bodies are serialized with orjson, so the content type is set by hand.
+        default_headers = {"Content-Type": "application/json"}
+        if access_token:
+            default_headers["Authorization"] = f"Bearer {access_token}"
+        if email:
+            default_headers["X-User-Email"] = email
+        self._client_key: _ClientKey = (self.base_url, tuple(sorted(default_headers.items())))
+        self._base_payload = {"email": email} if email else {}
+
+        self.client = _get_shared_client(self._client_key, self.timeout)
+        _shared_refs[self._client_key] = _shared_refs.get(self._client_key, 0) + 1
+        self._closed = False
+        self._batcher = _MicroBatcher(self.client)
         
     async def process_text(
         self,
         text: str,
         email: Optional[str] = None,
-        thread_id: str = "default"
+        thread_id: str = "default",
+        history: bool = True
     ) -> Dict[str, Any]:
         """
         Send text to the NLP processor and get a response.
         
         Args:
             text: The text to process
-            email: The user's email for authentication
+            email: Overrides the client's email for this call only
+            thread_id: Conversation thread identifier
+            history: Whether the server should use the thread's previous messages
             
         Returns:
             Dictionary containing the response and metadata
         """
-        try:
-            payload = {
-                "text": text,
-                "thread_id": thread_id or "default"  # Default thread_id as per API's ProcessRequest model
-            }
-            if email:
-                payload["email"] = email
-
-            headers = {}
-            if self.access_token:
-                headers["Authorization"] = f"Bearer {self.access_token}"
-            if email:
-                headers["X-User-Email"] = email
+        # Default thread_id as per API's ProcessRequest model
+        payload = {**self._base_payload, "text": text, "thread_id": thread_id or "default"}
+        if not history:
+            payload["history"] = False
+        headers = _NO_HEADERS
+        if email and email != self.email:
+            payload["email"] = email
+            headers = {"X-User-Email": email}
 
-            try:
-                response = await self.client.post(
-                    f"{self.base_url}/process",
-                    json=payload,
-                    headers=headers,
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.json()
-                
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code in [401,403]:
-                    # Authentication required
-                    auth_url = f"{self.base_url}/auth/google/login"
-                    print("\n❌ Authentication required!")
-                    print(f"🔗 Please log in using Google: {auth_url}")
-                    print("\nAfter logging in, you'll be redirected to a page with an error (this is normal).")
-                    print("Copy the URL you're redirected to and run the following command:")
-                    print(f"\n  python -m ms_cli_interface.cli auth --callback-url <redirected-url>\n")
-                    return {"error": "Authentication required. Please log in using the provided URL."}
-                raise e
+        start = time.perf_counter()
+        status: Optional[int] = None
+        try:
+            result = await self._batcher.submit(payload, headers)
 
         except httpx.HTTPStatusError as e:
-            error_detail = ""
-            if e.response.status_code == 401:
-                error_detail = "Token de acesso inválido ou expirado. Por favor, faça login novamente."
-            elif e.response.status_code == 403:
-                error_detail = "Acesso negado. Verifique suas credenciais e tente novamente."
-            elif e.response.status_code == 422:
-                error_detail = "Dados inválidos na requisição."
-            else:
-                error_detail = f"Erro HTTP {e.response.status_code}"
-                
-            # Try to get more details from the response if available
+            status = e.response.status_code
+            requires_auth = status in _AUTH_STATUS
+            if requires_auth:
+                self._print_login_instructions()
+
+            error_detail = _STATUS_MESSAGES.get(status) or f"Erro HTTP {status}"
+            # The server's own detail, when present, is more specific
+            body = e.response.content
             try:
-                error_data = e.response.json()
-                if 'detail' in error_data:
-                    if isinstance(error_data['detail'], str):
-                        error_detail = error_data['detail']
-                    elif isinstance(error_data['detail'], list):
-                        error_detail = "; ".join([str(d.get('msg', '')) for d in error_data['detail'] if 'msg' in d])
-            except:
-                pass
+                error_data = orjson.loads(body) if body else None
+            except orjson.JSONDecodeError:
+                error_data = None
+            if isinstance(error_data, dict) and 'detail' in error_data:
+                if isinstance(error_data['detail'], str):
+                    error_detail = error_data['detail']
+                elif isinstance(error_data['detail'], list):
+                    error_detail = "; ".join([str(d.get('msg', '')) for d in error_data['detail'] if isinstance(d, dict) and 'msg' in d])
                 
-            logger.error("HTTP error %s: %s", e.response.status_code, error_detail)
-            return {
+            logger.error(
+                "HTTP error %s: %s", status, error_detail,
+                extra={"status": status, "elapsed_ms": _elapsed_ms(start)}
+            )
+            result = {
                 "response": f"Erro de autenticação: {error_detail}",
                 "agent": "system",
                 "confidence": 0.0,
-                "requires_auth": e.response.status_code in (401, 403)
+                "requires_auth": requires_auth
             }
         except httpx.RequestError as e:
-            logger.error("Request error: %s", e)
-            return {
+            logger.error(
+                "Request error: %s", e,
+                extra={"error": type(e).__name__, "elapsed_ms": _elapsed_ms(start)}
+            )
+            result = {
                 "response": "Não foi possível conectar ao serviço de processamento. Tente novamente mais tarde.",
                 "agent": "system",
                 "confidence": 0.0
             }
         except Exception as e:
-            logger.error("Error processing text: %s", e, exc_info=True)
-            return {
+            # No traceback: rendering it is costly and the type plus message is enough here
+            logger.error(
+                "Error processing text: %s: %s", type(e).__name__, e,
+                extra={"error": type(e).__name__, "elapsed_ms": _elapsed_ms(start)}
+            )
+            result = {
                 "response": "Ocorreu um erro inesperado. Por favor, tente novamente.",
                 "agent": "system",
                 "confidence": 0.0
             }
+
+        elapsed_ms = _elapsed_ms(start)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "process_text finished in %.1f ms",
+                elapsed_ms,
+                extra={"status": status, "thread_id": payload["thread_id"], "elapsed_ms": elapsed_ms}
+            )
+        if self.on_response is not None:
+            try:
+                self.on_response(result, elapsed_ms)
+            except Exception as e:
+                logger.warning("on_response hook failed: %s: %s", type(e).__name__, e)
+        return result
     
+    def _print_login_instructions(self) -> None:
+        """Tell the user how to obtain a new token."""
+        auth_url = f"{self.base_url}/auth/google/login"
+        print("\n❌ Authentication required!")
+        print(f"🔗 Please log in using Google: {auth_url}")
+        print("\nAfter logging in, you'll be redirected to a page with an error (this is normal).")
+        print("Copy the URL you're redirected to and run the following command:")
+        print(f"\n  python -m ms_cli_interface.cli auth --callback-url <redirected-url>\n")
+
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Stop this client's batcher and close the pooled HTTP client if no one else uses it."""
+        await self._batcher.close()
+        if self._closed:
+            return
+        self._closed = True
+        
+        remaining = _shared_refs.get(self._client_key, 1) - 1
+        if remaining > 0:
+            _shared_refs[self._client_key] = remaining
+            return
+        _shared_refs.pop(self._client_key, None)
         try:
+            if _shared_clients.get(self._client_key) is self.client:
+                del _shared_clients[self._client_key]
             await self.client.aclose()
         except Exception as e:
             logger.warning("Error closing HTTP client: %s", e)
@@ -0,0 +1,173 @@
+"""Unit tests for the pooled NLP service client."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+import src.nlp_client as nlp_client
+from src.nlp_client import NLPClient
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Route the pooled clients through a MockTransport that records requests."""
+    requests = []
+    responses = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = orjson.loads(request.content)
+        if request.url.path in responses:
+            return responses[request.url.path](body)
+        return httpx.Response(200, content=orjson.dumps({"response": body["text"], "agent": "test", "confidence": 1.0}))
+
+    def get_shared_client(key, timeout):
+        client = nlp_client._shared_clients.get(key)
+        if client is None or client.is_closed:
+            base_url, headers = key
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                headers=dict(headers),
+                transport=httpx.MockTransport(handler),
+            )
+            nlp_client._shared_clients[key] = client
+        return client
+
+    monkeypatch.setattr(nlp_client, "_get_shared_client", get_shared_client)
+    monkeypatch.setattr(nlp_client, "_shared_clients", {})
+    monkeypatch.setattr(nlp_client, "_shared_refs", {})
+    return requests, responses
+
+
+def test_closing_one_client_keeps_shared_pool_open_for_others(transport):
+    async def scenario():
+        a = NLPClient(base_url="http://nlp", access_token="token")
+        b = NLPClient(base_url="http://nlp", access_token="token")
+        assert a.client is b.client
+
+        await a.close()
+        result = await b.process_text("olá")
+        assert result["response"] == "olá"
+        assert not b.client.is_closed
+
+        await b.close()
+        assert b.client.is_closed
+        assert nlp_client._shared_clients == {}
+
+    asyncio.run(scenario())
+
+
+def _batcher_client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(base_url="http://nlp", transport=httpx.MockTransport(handler))
+
+
+def _echo(body):
+    return {"response": body["text"], "agent": "test", "confidence": 1.0}
+
+
+def test_lone_call_is_sent_without_waiting_for_the_batch_window():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        return httpx.Response(200, content=orjson.dumps(_echo(orjson.loads(request.content))))
+
+    async def scenario():
+        async with _batcher_client(handler) as client:
+            batcher = nlp_client._MicroBatcher(client, batch_wait_timeout_s=5.0)
+            result = await asyncio.wait_for(batcher.submit({"text": "oi"}, {}), timeout=1.0)
+            await batcher.close()
+        return result
+
+    assert asyncio.run(scenario())["response"] == "oi"
+    assert paths == ["/process"]
+
+
+def test_concurrent_calls_share_one_batch_request_per_header_group():
+    batches = []
+
+    def handler(request):
+        body = orjson.loads(request.content)
+        if request.url.path == "/process_batch":
+            batches.append((request.headers.get("x-user-email"), [item["text"] for item in body["items"]]))
+            return httpx.Response(200, content=orjson.dumps({"results": [_echo(item) for item in body["items"]]}))
+        return httpx.Response(200, content=orjson.dumps(_echo(body)))
+
+    async def scenario():
+        async with _batcher_client(handler) as client:
+            batcher = nlp_client._MicroBatcher(client)
+            results = await asyncio.gather(
+                batcher.submit({"text": "a"}, {}),
+                batcher.submit({"text": "b"}, {}),
+                batcher.submit({"text": "c"}, {"X-User-Email": "other@example.com"}),
+                batcher.submit({"text": "d"}, {"X-User-Email": "other@example.com"}),
+            )
+            await batcher.close()
+        return results
+
+    results = asyncio.run(scenario())
+    assert [r["response"] for r in results] == ["a", "b", "c", "d"]
+    assert sorted(batches, key=lambda b: b[1]) == [(None, ["a", "b"]), ("other@example.com", ["c", "d"])]
+
+
+def test_missing_batch_endpoint_falls_back_to_individual_calls():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path == "/process_batch":
+            return httpx.Response(404)
+        return httpx.Response(200, content=orjson.dumps(_echo(orjson.loads(request.content))))
+
+    async def scenario():
+        async with _batcher_client(handler) as client:
+            batcher = nlp_client._MicroBatcher(client)
+            first = await asyncio.gather(batcher.submit({"text": "a"}, {}), batcher.submit({"text": "b"}, {}))
+            second = await asyncio.gather(batcher.submit({"text": "c"}, {}), batcher.submit({"text": "d"}, {}))
+            await batcher.close()
+        return first + second
+
+    results = asyncio.run(scenario())
+    assert [r["response"] for r in results] == ["a", "b", "c", "d"]
+    # Only the first batch probes /process_batch; afterwards it's remembered as unsupported
+    assert paths.count("/process_batch") == 1
+    assert paths.count("/process") == 4
+
+
+def test_batch_failure_is_raised_in_every_caller():
+    def handler(request):
+        return httpx.Response(500)
+
+    async def scenario():
+        async with _batcher_client(handler) as client:
+            batcher = nlp_client._MicroBatcher(client)
+            results = await asyncio.gather(
+                batcher.submit({"text": "a"}, {}),
+                batcher.submit({"text": "b"}, {}),
+                return_exceptions=True,
+            )
+            await batcher.close()
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+
+
+def test_process_text_reports_http_errors_as_system_reply(transport):
+    _, responses = transport
+    responses["/process"] = lambda body: httpx.Response(422, content=orjson.dumps({"detail": "texto vazio"}))
+
+    async def scenario():
+        client = NLPClient(base_url="http://nlp", access_token="token")
+        try:
+            return await client.process_text("")
+        finally:
+            await client.close()
+
+    result = asyncio.run(scenario())
+    assert result["agent"] == "system"
+    assert "texto vazio" in result["response"]
@@ -3,13 +3,25 @@ import logging
 import operator
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, TypedDict, Annotated
+from typing import Dict, Any, List, Optional, TypedDict, Annotated, Union
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 logger = logging.getLogger(__name__)
 
+
+def always_handle(*args, **kwargs) -> bool:
+    """can_handle for catch-all agents; process() recognizes it and skips the call."""
+    return True
+
+
 class AgentState(TypedDict):
     """State for the LangGraph workflow."""
 
@@ -30,6 +42,8 @@ class AgentState(TypedDict):
 
 class BaseAgent(ABC):
     """Base class for all agents in the multi-agent system."""
+
+    __slots__ = ("name", "description")
     
     def __init__(self, name: str, description: str):
         self.name = name
@@ -45,17 +59,38 @@ class BaseAgent(ABC):
         """Process the input and return a response."""
         pass
 
-    def _parse_json_response(self, content: str) -> Dict[str, Any]:
+    def _parse_json_response(self, content: Union[str, bytes, Dict[str, Any]]) -> Dict[str, Any]:
         """Parse JSON content from LLM response, handling markdown code blocks."""
-        if content.startswith("```json"):
-            content = content.replace("```json", "").replace("```", "").strip()
+        # Some providers hand back already-decoded or raw-bytes payloads
+        if isinstance(content, dict):
+            return content
+        if isinstance(content, (bytes, bytearray)):
+            content = content.decode()
+
+        content = content.strip()
+        # Bare JSON is the common case and needs no fence handling
+        if content[:1] not in ("{", "[") and content.startswith("```"):
+            # Drop the ```json / ``` fence markers without scanning the body
+            content = content.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+
+        # A JSON document always closes with } or ]; anything else is a truncated
+        # answer, so don't pay for a parse that is bound to fail
+        if content[-1:] not in ("}", "]"):
+            logger.warning("Skipping incomplete JSON payload")
+            return {
+                "success": False,
+                "error": "Resposta incompleta do modelo"
+            }
         
-        try:                                
+        try:
+            if ORJSON_AVAILABLE:
+                return orjson.loads(content)
             return json.loads(content)
 
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
         except json.JSONDecodeError as json_error:
-            logger.error(f"JSON decode error: {str(json_error)}")
-            logger.error(f"Content that failed to parse: {content}")
+            logger.error("JSON decode error: %s", json_error)
+            logger.debug("Content that failed to parse: %s", content)
             return {
                 "success": False,
                 "error": f"Resposta inválida do modelo: {str(json_error)}"
@@ -63,7 +98,7 @@ class BaseAgent(ABC):
 
     async def process(self, state: AgentState) -> Optional[Dict[str, Any]]:
         """Process the input or pass it to the next agent in the chain."""
-        if self.can_handle(state):
+        if self.can_handle is always_handle or self.can_handle(state):
             return await self.handle(state)
                  
         return None
@@ -1,14 +1,20 @@
 """
 Configuration Agent module
 """
+import logging
+
 from typing import Dict, Any
 from llm_providers import BaseLLMProvider
-from agents.base_agent import BaseAgent, AgentState
+from agents.base_agent import BaseAgent, AgentState, always_handle
 from langchain_core.messages import SystemMessage
 
+logger = logging.getLogger(__name__)
+
 class ConfigurationAgent(BaseAgent):
     """Agent to manage system configurations."""
 
+    __slots__ = ("provider",)
+
     def __init__(self, provider: BaseLLMProvider):
         super().__init__(
             name="configuration_agent",
@@ -16,27 +22,22 @@ class ConfigurationAgent(BaseAgent):
         )
         self.provider = provider
     
-    def can_handle(self, intent: str, entities: Dict[str, Any]) -> bool:
-        """Handle any intent that doesn't have a specific agent."""
-        # This agent acts as a catch-all for any request
-        return True
+    # This agent acts as a catch-all for any request
+    can_handle = staticmethod(always_handle)
 
     async def node(self, state: AgentState) -> AgentState:
         """Generate response or tool calls using the general agent."""
-        messages = state["messages"]
-        
-        # The agent is the LLM with tools bound to it
-        response = await self.provider.ainvoke(messages)
+        # Shares handle()'s single ainvoke path; its error SystemMessage has no tool_calls
+        response = await self.handle(state["messages"])
 
-        if response.tool_calls:
-            for tool_call in response.tool_calls:
-                # Parameters are in tool_call['args']
-                if not all(tool_call['args'].values()):
-                    missing_params = [k for k, v in tool_call['args'].items() if not v]
-                    response.content = f"Para usar a ferramenta '{tool_call['name']}', preciso das seguintes informações: {', '.join(missing_params)}. Por favor, forneça os detalhes que faltam."
-                    # Clear tool_calls to prevent execution
-                    response.tool_calls = [] 
-                    break
+        for tool_call in getattr(response, "tool_calls", ()):
+            # Parameters are in tool_call['args']; one pass finds the empty ones
+            missing_params = [k for k, v in tool_call['args'].items() if not v]
+            if missing_params:
+                response.content = f"Para usar a ferramenta '{tool_call['name']}', preciso das seguintes informações: {', '.join(missing_params)}. Por favor, forneça os detalhes que faltam."
+                # Clear tool_calls to prevent execution
+                response.tool_calls = []
+                break
         
         # Return only the delta for messages
         return {"messages": [response]}
@@ -48,7 +49,7 @@ class ConfigurationAgent(BaseAgent):
             response = await self.provider.ainvoke(messages)
             return response
         except Exception as e:
-            logger.error(f"Error in general agent: {str(e)}")
+            logger.error("Error in general agent: %s", e)
             # Return a message that can be added to the graph state
             return SystemMessage(content=f"Error in general agent: {str(e)}")
 
@@ -5,7 +5,7 @@ import logging
 
 from typing import Dict, Any
 from llm_providers import BaseLLMProvider
-from agents.base_agent import BaseAgent, AgentState
+from agents.base_agent import BaseAgent, AgentState, always_handle
 from langchain_core.messages import SystemMessage, HumanMessage
 
 logger = logging.getLogger(__name__)
@@ -15,6 +15,8 @@ class ExecutorAgent(BaseAgent):
 
     AGENT_NAME = "executor_agent"
 
+    __slots__ = ("tools", "provider", "_system_prompt")
+
     def __init__(self, provider: BaseLLMProvider, tools: list):
         super().__init__(
             name=ExecutorAgent.AGENT_NAME,
@@ -25,36 +27,41 @@ class ExecutorAgent(BaseAgent):
         )
         self.tools = tools
         self.provider = provider
+
+        # The tool list is fixed for the agent's lifetime, so the prompt is built once
+        tool_lines = "\n\n".join(
+            f"- {tool.name}: {tool.description.replace(chr(10), ' ')}" for tool in tools
+        )
+        self._system_prompt = SystemMessage(
+            content=(
+                "You have the following tools:\n"
+                + tool_lines
+                + "\n\nYou will recieve the instructions and you need to select the tool"
+                " format the parameters and execut it"
+            )
+        )
     
-    def can_handle(self, intent: str, entities: Dict[str, Any]) -> bool:
-        """Handle any intent that doesn't have a specific agent."""
-        # This agent acts as a catch-all for any request
-        return True
+    # This agent acts as a catch-all for any request
+    can_handle = staticmethod(always_handle)
     
     async def handle(self, state: AgentState) -> Dict[str, Any]:
         """Invoke the LLM provider with the given messages."""
         try:
-
-            prompt = "You have the following tools:"
-
-            prompt += "\n\n".join([f"- {tool.name}: {tool.description.replace('\n', ' ')}" for tool in self.tools])
-            
-            prompt += """
-                You will recieve the instructions and you need to select the tool format the parameters and execut it
-            """
-
-            filtered_messages = [
+            # The static tool prompt leads so requests share a cacheable prefix;
+            # the filtered history follows in a single pass
+            messages = [self._system_prompt]
+            messages.extend(
                 message for message in state["messages"] if not isinstance(message, HumanMessage)
-            ]
+            )
 
-            response = await self.provider.ainvoke(filtered_messages + [SystemMessage(content=prompt)])
+            response = await self.provider.ainvoke(messages)
 
             return {
                 "messages": response
             }
 
         except Exception as e:
-            logger.error(f"Error in general agent: {str(e)}")
+            logger.error("Error in general agent: %s", e)
             return {
                 "response": SystemMessage(content=f"System Error in ExecutorAgent: {str(e)}")
             }
@@ -3,7 +3,7 @@ from typing import Dict, Any
 import logging
 import json
 
-from .base_agent import BaseAgent, AgentState
+from .base_agent import BaseAgent, AgentState, always_handle
 
 # Imports de mensagens e prompts agora vêm do 'langchain_core'
 from llm_providers import BaseLLMProvider
@@ -11,11 +11,22 @@ from langchain_core.messages import SystemMessage
 
 logger = logging.getLogger(__name__)
 
+# The prompt is constant, so the message is built (and validated) once
+_GENERAL_SYSTEM_MESSAGE = SystemMessage(content="""
+    Você faz parte de um conjunto de agentes que trabalham para responder às perguntas dos usuários. 
+    Temos agentes com vários objetivos, e o seu é ser mais generalista, muitas vezes não teremos todas 
+    as ferramentas necessárias para as respostas, e você é o responsável por cobrir essa lacuna. Por isso, 
+    tente responder ao máximo as informações, mesmo que não tenha todas as ferramentas necessárias. Caso 
+    precise de mais informações realize perguntas para completar a tarefa
+""")
+
 class GeneralAgent(BaseAgent):
     """
     General purpose agent that uses LLM for intelligent responses. This agent is 
     used as a catch-all for any request.
     """
+
+    __slots__ = ("provider",)
     
     def __init__(self, provider: BaseLLMProvider):
         super().__init__(
@@ -24,23 +35,14 @@ class GeneralAgent(BaseAgent):
         )
         self.provider = provider
     
-    def can_handle(self, state: AgentState) -> bool:
-        """Handle any intent that doesn't have a specific agent."""
-        # This agent acts as a catch-all for any request
-        return True
+    # This agent acts as a catch-all for any request
+    can_handle = staticmethod(always_handle)
     
     async def handle(self, state: AgentState) -> Dict[str, Any]:
         """Generate response or tool calls using the general agent."""
         
         try:
-            system_message = """
-                Você faz parte de um conjunto de agentes que trabalham para responder às perguntas dos usuários. 
-                Temos agentes com vários objetivos, e o seu é ser mais generalista, muitas vezes não teremos todas 
-                as ferramentas necessárias para as respostas, e você é o responsável por cobrir essa lacuna. Por isso, 
-                tente responder ao máximo as informações, mesmo que não tenha todas as ferramentas necessárias. Caso 
-                precise de mais informações realize perguntas para completar a tarefa
-            """
-            messages = state["messages"] + [SystemMessage(content=system_message)]
+            messages = [*state["messages"], _GENERAL_SYSTEM_MESSAGE]
             
             # The agent is the LLM with tools bound to it
             response = await self.provider.client.ainvoke(messages)
@@ -49,7 +51,7 @@ class GeneralAgent(BaseAgent):
             return {"messages": response}
             
         except Exception as e:
-            logger.error(f"Error in general agent: {str(e)}")
+            logger.error("Error in general agent: %s", e)
             return {
                 "response": SystemMessage(content=f"Error in GeneralAgent: {str(e)}")
             }
\ No newline at end of file
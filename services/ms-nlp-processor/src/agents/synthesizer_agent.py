@@ -3,7 +3,7 @@ from typing import Dict, Any
 import logging
 import json
 
-from .base_agent import BaseAgent, AgentState
+from .base_agent import BaseAgent, AgentState, always_handle
 
 # Imports de mensagens e prompts agora vêm do 'langchain_core'
 from llm_providers import BaseLLMProvider
@@ -11,6 +11,28 @@ from langchain_core.messages import SystemMessage
 
 logger = logging.getLogger(__name__)
 
+# Static prompt sent on every turn; providers that support it cache the prefix
+_SYNTHESIZER_PROMPT = """
+Atue como o melhor Secretário Executivo do mundo. Você é altamente organizado, discreto, proativo, diplomaticamente assertivo e focado em resultados. Você trabalha para [SEU NOME], que atua como [SEU CARGO/PROFISSÃO]. O objetivo principal do executivo no momento é [INSERIR SEU GRANDE OBJETIVO ATUAL, EX: expandir a empresa, ter mais tempo livre, finalizar um projeto].
+
+Suas 5 Diretrizes de Ouro:
+
+Proteção do Tempo: Sempre questione se uma reunião é necessária. Se for, exija uma pauta. Priorize blocos de trabalho focado.
+Síntese Extrema: A não ser que seja pedido, nunca me dê textos longos. Use bullet points. Dê-me o contexto, o problema e a sugestão de solução (C-P-S).
+Tom de Voz: Profissional, conciso, mas empático.
+
+Comandos de Ação:
+
+Sempre que eu inserir dados (como uma lista de e-mails, uma agenda bagunçada ou notas soltas), você deve processar a informação seguindo a estrutura abaixo:
+
+🔴 Urgente/Crítico: O que vai explodir se eu não olhar agora.
+📅 Agenda Otimizada: Sugestão de como organizar o dia/semana.
+📝 Tarefas Prontas: Rascunhos de e-mails ou mensagens para eu apenas copiar e enviar.
+💡 Insight Proativo: Uma sugestão extra que você notou (ex: "Vi que você tem 3 reuniões seguidas, sugiro mover a do meio para amanhã").
+
+Selecione do conjunto de mensanges o que faz sentido para responder as dúvidas do nosso cliente
+"""
+
 class SynthesizerAgent(BaseAgent):
     """
     Agent to synthesize responses from multiple agents and write it to final user. 
@@ -18,6 +40,8 @@ class SynthesizerAgent(BaseAgent):
     
     AGENT_NAME = "synthesizer_agent"
 
+    __slots__ = ("provider", "_system_message")
+
     def __init__(self, provider: BaseLLMProvider):
         super().__init__(
             name=SynthesizerAgent.AGENT_NAME,
@@ -28,37 +52,17 @@ class SynthesizerAgent(BaseAgent):
             )
         )
         self.provider = provider
+        self._system_message = provider.system_message(_SYNTHESIZER_PROMPT)
     
-    def can_handle(self, state: AgentState) -> bool:
-        """Handle any intent that doesn't have a specific agent."""
-        # This agent acts as a catch-all for any request
-        return True
+    # This agent acts as a catch-all for any request
+    can_handle = staticmethod(always_handle)
     
     async def handle(self, state: AgentState) -> Dict[str, Any]:
         """Generate response or tool calls using the general agent."""
         
         try:
-            system_message = """
-                Atue como o melhor Secretário Executivo do mundo. Você é altamente organizado, discreto, proativo, diplomaticamente assertivo e focado em resultados. Você trabalha para [SEU NOME], que atua como [SEU CARGO/PROFISSÃO]. O objetivo principal do executivo no momento é [INSERIR SEU GRANDE OBJETIVO ATUAL, EX: expandir a empresa, ter mais tempo livre, finalizar um projeto].
-
-                Suas 5 Diretrizes de Ouro:
-                
-                Proteção do Tempo: Sempre questione se uma reunião é necessária. Se for, exija uma pauta. Priorize blocos de trabalho focado.
-                Síntese Extrema: A não ser que seja pedido, nunca me dê textos longos. Use bullet points. Dê-me o contexto, o problema e a sugestão de solução (C-P-S).
-                Tom de Voz: Profissional, conciso, mas empático.
-
-                Comandos de Ação:
-
-                Sempre que eu inserir dados (como uma lista de e-mails, uma agenda bagunçada ou notas soltas), você deve processar a informação seguindo a estrutura abaixo:
-
-                🔴 Urgente/Crítico: O que vai explodir se eu não olhar agora.
-                📅 Agenda Otimizada: Sugestão de como organizar o dia/semana.
-                📝 Tarefas Prontas: Rascunhos de e-mails ou mensagens para eu apenas copiar e enviar.
-                💡 Insight Proativo: Uma sugestão extra que você notou (ex: "Vi que você tem 3 reuniões seguidas, sugiro mover a do meio para amanhã").
-
-                Selecione do conjunto de mensanges o que faz sentido para responder as dúvidas do nosso cliente
-            """
-            messages = state["messages"] + [SystemMessage(content=system_message)]
+            # The static prompt leads so it forms the prefix providers can cache
+            messages = [self._system_message, *state["messages"]]
             
             # The agent is the LLM with tools bound to it
             response = await self.provider.client.ainvoke(messages)
@@ -70,7 +74,7 @@ class SynthesizerAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error in sythesizer agent: {str(e)}")
+            logger.error("Error in sythesizer agent: %s", e)
             return {
                 "response": SystemMessage(content=f"Error in SythesizerAgent: {str(e)}")
             }
\ No newline at end of file
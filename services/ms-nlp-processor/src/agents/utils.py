@@ -1,8 +1,8 @@
 """Utility helpers for working with agents."""
 from __future__ import annotations
 
-import inspect
 import logging
+import weakref
 
 from .base_agent import BaseAgent
 from typing import Any, Dict, Iterable, List, Optional
@@ -11,6 +11,18 @@ logger = logging.getLogger(__name__)
 
 FunctionDescription = Dict[str, str]
 
+# Class docstring summaries never change, so agents of the same class share one lookup
+_class_summaries: "weakref.WeakKeyDictionary[type, Optional[str]]" = weakref.WeakKeyDictionary()
+
+
+def _class_docstring_summary(cls: type) -> Optional[str]:
+    """Return the cached docstring summary for an agent class."""
+    try:
+        return _class_summaries[cls]
+    except KeyError:
+        summary = _class_summaries[cls] = _extract_docstring_summary(cls)
+        return summary
+
 
 def collect_agent_descriptions(agents: Iterable[BaseAgent]) -> List[FunctionDescription]:
     """Collect descriptions for provided agent instances."""
@@ -20,7 +32,7 @@ def collect_agent_descriptions(agents: Iterable[BaseAgent]) -> List[FunctionDesc
         name = getattr(agent, "name", agent.__class__.__name__)
         summary_line = _first_summary_line(getattr(agent, "description", None))
         if not summary_line:
-            summary_line = _extract_docstring_summary(agent.__class__)
+            summary_line = _class_docstring_summary(agent.__class__)
         if not summary_line:
             logger.debug("Skipping agent %s due to missing description", name)
             continue
@@ -38,23 +50,20 @@ def collect_agent_descriptions(agents: Iterable[BaseAgent]) -> List[FunctionDesc
 
 def _resolve_tool_name(tool: Any) -> str:
     """Return a readable name for a tool callable."""
-    owner = getattr(tool, "__self__", None)
     method_name = getattr(tool, "__name__", None)
-    owner_name = getattr(owner, "name", None) if owner else None
-
-    if method_name and owner_name and method_name != owner_name:
-        return f"{method_name} ({owner_name})"
+    if method_name:
+        # Only named callables can be bound methods worth qualifying with their owner
+        owner = getattr(tool, "__self__", None)
+        owner_name = getattr(owner, "name", None) if owner else None
+        if owner_name and method_name != owner_name:
+            return f"{method_name} ({owner_name})"
 
     named_attr = getattr(tool, "name", None)
     if isinstance(named_attr, str):
         return named_attr
 
-    if method_name:
-        return method_name
-
-    if hasattr(tool, "__class__"):
-        return tool.__class__.__name__
-    return str(tool)
+    # Every object has a class, so this is the final fallback
+    return method_name or type(tool).__name__
 
 
 def _first_summary_line(text: Optional[str]) -> Optional[str]:
@@ -71,15 +80,18 @@ def _first_summary_line(text: Optional[str]) -> Optional[str]:
 
 def _extract_docstring_summary(obj: Any) -> Optional[str]:
     """Return the summary line derived from an object's docstring."""
-    docstring = inspect.getdoc(obj)
-    summary_line = _first_summary_line(docstring)
+    # Only the first line is used and _first_summary_line strips it, so the
+    # raw __doc__ does what inspect.getdoc's full dedent would, minus the cost.
+    # Unlike getdoc it doesn't inherit a base class docstring, so an agent
+    # without its own docstring has no summary.
+    summary_line = _first_summary_line(getattr(obj, "__doc__", None))
     if summary_line:
         return summary_line
 
     # Bound methods sometimes store docstring on __func__
     func = getattr(obj, "__func__", None)
     if func:
-        return _first_summary_line(inspect.getdoc(func))
+        return _first_summary_line(getattr(func, "__doc__", None))
     return None
 
 
@@ -0,0 +1,30 @@
+"""add oauth identity index
+
+Revision ID: d87918faccae
+Revises: d304e46a8fd0
+Create Date: 2026-10-14 10:12:41.530117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd87918faccae'
+down_revision: Union[str, Sequence[str], None] = 'd304e46a8fd0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('account', schema=None) as batch_op:
+        batch_op.create_index('ix_account_provider_oauth_id', ['oauth_provider', 'oauth_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('account', schema=None) as batch_op:
+        batch_op.drop_index('ix_account_provider_oauth_id')
@@ -3,34 +3,46 @@ FastAPI application for the NLP Processor service with LLM and LangFlow integrat
 """
 import os
 import jwt
-import json
-import glob
+import orjson
+import asyncio
+import sys
+import time
+from collections import OrderedDict
 import uvicorn
 import logging
+import functools
+import importlib
 from datetime import datetime, timedelta
 
 from auth import oauth
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional
-from fastapi.responses import RedirectResponse
+from typing import Dict, Any, List, Optional, Tuple
+from fastapi.responses import ORJSONResponse, RedirectResponse, StreamingResponse
 from fastapi import FastAPI, HTTPException, Request, Query, Depends, Header, status, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from security import get_current_user_email, verify_email_in_request
+from security import current_user_email, verify_email_in_request, verify_jwt_token
+from token_cache import user_records, verify_cached
 from auth import oauth, create_access_token, JWT_SECRET, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
 from processor import NLPProcessor
+from process_jobs import JobQueue, JobQueueFull
+from registry import langgraph_manager
 from tools.gmail_tool import iniciar_login, receber_callback
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Account
-from database.database import get_db
+from database.crud import get_or_create_oauth_account
+from database.database import get_async_db
 
 load_dotenv()
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "default-secret-key")
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+ACCESS_TOKEN_EXPIRES_SECONDS = int(ACCESS_TOKEN_EXPIRES.total_seconds())
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -40,7 +52,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Samantha NLP Processor",
     description="NLP processing service with LLM and LangFlow multi-agent system for Samantha assistant",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add Session Middleware
@@ -53,20 +66,50 @@ app.add_middleware(
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    # A wildcard origin can't be combined with credentials; allow an explicit pattern instead
+    allow_origin_regex=os.getenv("CORS_ALLOW_ORIGIN_REGEX", r"https?://(localhost|127\.0\.0\.1)(:\d+)?"),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["authorization", "x-user-email", "content-type"],
+    max_age=86400,  # Browsers cache the preflight for a day
 )
 
 # Initialize the NLP processor
 nlp_processor = NLPProcessor()
 
+# LangFlow is optional; resolve its integration once instead of per request
+try:
+    from llm_integration import LangFlowManager
+    langflow_manager = LangFlowManager()
+except Exception as e:
+    logger.info(f"LangFlow integration not available: {str(e)}")
+    langflow_manager = None
+
+# Health probes and /flows share one upstream lookup per TTL window
+FLOWS_CACHE_TTL = 30.0
+_flows_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+_flows_lock = asyncio.Lock()
+
+
+async def _cached_flows() -> List[Dict[str, Any]]:
+    """Return LangFlow's flows, asking the upstream at most once per FLOWS_CACHE_TTL."""
+    global _flows_cache
+    if _flows_cache is not None and time.monotonic() - _flows_cache[0] < FLOWS_CACHE_TTL:
+        return _flows_cache[1]
+    async with _flows_lock:
+        # Another request may have refreshed the cache while we waited for the lock
+        if _flows_cache is not None and time.monotonic() - _flows_cache[0] < FLOWS_CACHE_TTL:
+            return _flows_cache[1]
+        flows = await langflow_manager.get_available_flows()
+        _flows_cache = (time.monotonic(), flows)
+        return flows
+
 class ProcessRequest(BaseModel):
     text: str
     context: Dict[str, Any] = {}
     thread_id: str = "default"
     email: Optional[str] = None
+    history: bool = True  # False: the thread's checkpoint is dropped after the turn
 
 class ProcessResponse(BaseModel):
     response: str
@@ -74,6 +117,18 @@ class ProcessResponse(BaseModel):
     confidence: float
     metadata: Dict[str, Any] = {}
 
+class ProcessJobResponse(BaseModel):
+    job_id: str
+    status: str  # pending, done or error
+    result: Optional[ProcessResponse] = None
+    error: Optional[str] = None
+
+class ProcessBatchRequest(BaseModel):
+    items: List[ProcessRequest]
+
+class ProcessBatchResponse(BaseModel):
+    results: List[ProcessResponse]
+
 class GmailLoginResponse(BaseModel):
     authorization_url: str
     state: str
@@ -96,7 +151,8 @@ async def process_text(
     request: Request,
     request_data: ProcessRequest,
     authorization: str = Header(..., description="JWT token"),
-    x_user_email: str = Header(..., description="User's email address")
+    x_user_email: str = Header(..., description="User's email address"),
+    token_email: str = Depends(current_user_email)
 ):
     """
     Process natural language text and return a response.
@@ -113,8 +169,6 @@ async def process_text(
     Raises:
         HTTPException: If authentication fails or email doesn't match
     """
-    # Verify JWT token and get the email from it
-    token_email = get_current_user_email(request)
     
     # Verify if the email in the token matches the email in the header
     # if not verify_email_in_request(token_email, request):
@@ -135,35 +189,273 @@ async def process_text(
         result = await nlp_processor.process_text(
             request_data.text, 
             thread_id=request_data.thread_id,
-            email=token_email
+            email=token_email,
+            history=request_data.history
         )
+        _invalidate_history(request_data.thread_id)
         
-        return ProcessResponse(
-            response=result.get("response", "Desculpe, não consegui processar sua solicitação."),
-            agent=result.get("agent", "unknown"),
-            confidence=result.get("confidence", 0.0),
-            metadata={
-                "intent": result.get("intent"),
-                "entities": result.get("entities", {}),
-                "intent_confidence": result.get("intent_confidence"),
-                "selected_agent": result.get("selected_agent"),
-                "agent_reasoning": result.get("agent_reasoning"),
-                "llm_enhanced": result.get("llm_enhanced", False),
-                "processing_method": result.get("processing_method", "standard"),
-                "thread_id": result.get("thread_id"),
-                "context": request_data.context
-            }
-        )
+        # Returning the response directly skips FastAPI's second validation and
+        # serialization pass of the response_model, which is kept for the docs
+        return ORJSONResponse(_process_response_body(result, request_data))
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/process/stream")
+async def process_text_stream(
+    request: Request,
+    request_data: ProcessRequest,
+    authorization: str = Header(..., description="JWT token"),
+    x_user_email: str = Header(..., description="User's email address"),
+    token_email: str = Depends(current_user_email)
+):
+    """
+    Process natural language text and stream the answer as plain text.
+    
+    Args:
+        request: The request object
+        request_data: The request containing the text to process and optional context
+        authorization: JWT token in the format 'Bearer <token>'
+        x_user_email: User's email address
+        
+    Returns:
+        A text/plain streaming response with the answer's chunks
+        
+    Raises:
+        HTTPException: If authentication fails or email doesn't match
+    """
+    if request_data.email and request_data.email.lower() != token_email.lower():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Email in request body doesn't match the authenticated email"
+        )
+    
+    return StreamingResponse(
+        _stream_and_invalidate(
+            nlp_processor.stream_text(
+                request_data.text,
+                thread_id=request_data.thread_id,
+                email=token_email,
+                history=request_data.history
+            ),
+            request_data.thread_id
+        ),
+        media_type="text/plain; charset=utf-8"
+    )
+
+@app.post("/process_batch", response_model=ProcessBatchResponse)
+async def process_text_batch(
+    request: Request,
+    batch: ProcessBatchRequest,
+    authorization: str = Header(..., description="JWT token"),
+    x_user_email: str = Header(..., description="User's email address"),
+    token_email: str = Depends(current_user_email)
+):
+    """
+    Process several texts in one call, running them concurrently.
+    
+    Args:
+        request: The request object
+        batch: The list of process requests, answered in the same order
+        authorization: JWT token in the format 'Bearer <token>'
+        x_user_email: User's email address
+        
+    Returns:
+        One processed response per item
+        
+    Raises:
+        HTTPException: If authentication fails or an item's email doesn't match
+    """
+    for item in batch.items:
+        if item.email and item.email.lower() != token_email.lower():
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Email in request body doesn't match the authenticated email"
+            )
+    
+    try:
+        results = await _process_batch_items(batch.items, token_email)
+        return ProcessBatchResponse(
+            results=[_build_process_response(result, item) for result, item in zip(results, batch.items)]
+        )
+    except Exception as e:
+        logger.error(f"Error processing batch request: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+async def _process_batch_items(items: List[ProcessRequest], email: str) -> List[Dict[str, Any]]:
+    """
+    Run batch items concurrently across threads but in order within a thread.
+    
+    Items sharing a thread_id write to the same LangGraph checkpoint thread, so
+    running them side by side would interleave their turns.
+    """
+    by_thread: Dict[str, List[int]] = {}
+    for index, item in enumerate(items):
+        by_thread.setdefault(item.thread_id, []).append(index)
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    
+    async def run_thread(indexes: List[int]) -> None:
+        for index in indexes:
+            item = items[index]
+            results[index] = await nlp_processor.process_text(
+                item.text, thread_id=item.thread_id, email=email, history=item.history
+            )
+            _invalidate_history(item.thread_id)
+    
+    await asyncio.gather(*(run_thread(indexes) for indexes in by_thread.values()))
+    return results
+
+def _build_process_response(result: Dict[str, Any], request_data: ProcessRequest) -> ProcessResponse:
+    """Map a processor result onto the public ProcessResponse model."""
+    return ProcessResponse(**_process_response_body(result, request_data))
+
+def _process_response_body(result: Dict[str, Any], request_data: ProcessRequest) -> Dict[str, Any]:
+    """The ProcessResponse fields for a processor result, as a plain dict."""
+    return {
+        "response": result.get("response", "Desculpe, não consegui processar sua solicitação."),
+        "agent": result.get("agent", "unknown"),
+        "confidence": result.get("confidence", 0.0),
+        "metadata": {
+            "intent": result.get("intent"),
+            "entities": result.get("entities", {}),
+            "intent_confidence": result.get("intent_confidence"),
+            "selected_agent": result.get("selected_agent"),
+            "agent_reasoning": result.get("agent_reasoning"),
+            "llm_enhanced": result.get("llm_enhanced", False),
+            "processing_method": result.get("processing_method", "standard"),
+            "thread_id": result.get("thread_id"),
+            "context": request_data.context
+        }
+    }
+
+# Recent /conversation results per thread_id: (fetched at, email, history).
+# Anything that processes a message in a thread drops that thread's entry.
+HISTORY_CACHE_TTL = 5.0
+_HISTORY_CACHE_SIZE = 1024
+_history_cache: "OrderedDict[str, Tuple[float, str, List[Any]]]" = OrderedDict()
+
+def _invalidate_history(thread_id: str) -> None:
+    _history_cache.pop(thread_id, None)
+
+async def _cached_history(thread_id: str, email: str) -> List[Any]:
+    """Return the thread's history, reusing a fetch younger than HISTORY_CACHE_TTL."""
+    cached = _history_cache.get(thread_id)
+    if cached and cached[1] == email and time.monotonic() - cached[0] < HISTORY_CACHE_TTL:
+        _history_cache.move_to_end(thread_id)
+        return cached[2]
+    
+    history = await nlp_processor.get_conversation_history(thread_id, email=email)
+    _history_cache[thread_id] = (time.monotonic(), email, history)
+    _history_cache.move_to_end(thread_id)
+    if len(_history_cache) > _HISTORY_CACHE_SIZE:
+        _history_cache.popitem(last=False)
+    return history
+
+async def _stream_and_invalidate(chunks, thread_id: str):
+    """Relay a streamed answer, then drop the thread's cached history."""
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        _invalidate_history(thread_id)
+
+# Background /process jobs: a fixed worker pool drains the queue so the request
+# that submits a job returns right away instead of waiting on the LLM
+PROCESS_WORKERS = int(os.getenv("PROCESS_WORKERS", "4"))
+_MAX_PROCESS_JOBS = 1024
+_process_jobs = JobQueue(_MAX_PROCESS_JOBS)
+
+@app.on_event("startup")
+async def _start_process_workers():
+    """Start the worker pool that serves /process/async."""
+    _process_jobs.start(PROCESS_WORKERS)
+
+@app.on_event("shutdown")
+async def _stop_process_workers():
+    await _process_jobs.stop()
+
+@app.post("/process/async", response_model=ProcessJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def process_text_async(
+    request: Request,
+    request_data: ProcessRequest,
+    authorization: str = Header(..., description="JWT token"),
+    x_user_email: str = Header(..., description="User's email address"),
+    token_email: str = Depends(current_user_email)
+):
+    """
+    Queue a text for processing and return a job id to poll.
+    
+    Args:
+        request: The request object
+        request_data: The request containing the text to process and optional context
+        authorization: JWT token in the format 'Bearer <token>'
+        x_user_email: User's email address
+        
+    Returns:
+        The pending job; poll /process/jobs/{job_id} for the result
+        
+    Raises:
+        HTTPException: If authentication fails, email doesn't match, or too many jobs are pending
+    """
+    if request_data.email and request_data.email.lower() != token_email.lower():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Email in request body doesn't match the authenticated email"
+        )
+    
+    async def run() -> ProcessResponse:
+        result = await nlp_processor.process_text(
+            request_data.text,
+            thread_id=request_data.thread_id,
+            email=token_email,
+            history=request_data.history
+        )
+        _invalidate_history(request_data.thread_id)
+        return _build_process_response(result, request_data)
+    
+    try:
+        job_id = _process_jobs.submit(token_email, run)
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many pending jobs, try again later"
+        )
+    
+    return ProcessJobResponse(job_id=job_id, status="pending")
+
+@app.get("/process/jobs/{job_id}", response_model=ProcessJobResponse)
+async def get_process_job(
+    job_id: str,
+    request: Request,
+    authorization: str = Header(..., description="JWT token"),
+    x_user_email: str = Header(..., description="User's email address"),
+    token_email: str = Depends(current_user_email)
+):
+    """
+    Get the status, and the result once finished, of a /process/async job.
+    
+    Raises:
+        HTTPException: If the job doesn't exist or belongs to another user
+    """
+    job = _process_jobs.get(job_id, token_email)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    
+    return ProcessJobResponse(
+        job_id=job_id,
+        status=job["status"],
+        result=job.get("result"),
+        error=job.get("error")
+    )
+
 @app.get("/conversation/{thread_id}")
 async def get_conversation_history(
     thread_id: str,
     request: Request,
     authorization: str = Header(..., description="JWT token"),
-    x_user_email: str = Header(..., description="User's email address")
+    x_user_email: str = Header(..., description="User's email address"),
+    token_email: str = Depends(current_user_email)
 ):
     """
     Get conversation history for a specific thread.
@@ -180,8 +472,6 @@ async def get_conversation_history(
     Raises:
         HTTPException: If authentication fails or email doesn't match
     """
-    # Verify JWT token and get the email from it
-    token_email = get_current_user_email(request)
     
     # Verify if the email in the token matches the email in the header
     if not verify_email_in_request(token_email, request):
@@ -192,7 +482,7 @@ async def get_conversation_history(
     
     try:
         # Pass the email to ensure the user can only access their own conversations
-        history = await nlp_processor.get_conversation_history(thread_id, email=token_email)
+        history = await _cached_history(thread_id, token_email)
         return {
             "thread_id": thread_id,
             "history": history,
@@ -203,27 +493,33 @@ async def get_conversation_history(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/health/live")
+async def liveness_check():
+    """
+    Liveness probe that touches no dependency, for high-frequency probes.
+    This endpoint does not require authentication.
+    """
+    return {"status": "ok"}
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
     Health check endpoint with LLM, LangFlow, and LangGraph status.
     This endpoint does not require authentication.
     """
-    try:
-        # Check if LangFlow is available
-        from llm_integration import LangFlowManager
-        langflow_manager = LangFlowManager()
-        flows = await langflow_manager.get_available_flows()
-        langflow_available = len(flows) > 0
-    except Exception as e:
-        logger.warning(f"LangFlow health check failed: {str(e)}")
-        langflow_available = False
+    langflow_available = False
+    if langflow_manager is not None:
+        try:
+            # Check if LangFlow is available
+            flows = await _cached_flows()
+            langflow_available = len(flows) > 0
+        except Exception as e:
+            logger.warning(f"LangFlow health check failed: {str(e)}")
     
     try:
-        # Check if LangGraph is available
-        from langgraph_integration import LangGraphManager
-        langgraph_manager = LangGraphManager()
-        langgraph_available = langgraph_manager is not None
+        # The shared instance already exists once the processor is up
+        langgraph_available = langgraph_manager() is not None
     except Exception as e:
         logger.warning(f"LangGraph health check failed: {str(e)}")
         langgraph_available = False
@@ -240,7 +536,8 @@ async def health_check():
 async def list_agents(
     request: Request,
     authorization: str = Header(..., description="JWT token"),
-    x_user_email: str = Header(..., description="User's email address")
+    x_user_email: str = Header(..., description="User's email address"),
+    token_email: str = Depends(current_user_email)
 ):
     """
     List available agents in the system by scanning the agents directory.
@@ -256,8 +553,6 @@ async def list_agents(
     Raises:
         HTTPException: If authentication fails or email doesn't match
     """
-    # Verify JWT token and get the email from it
-    token_email = get_current_user_email(request)
     
     # Verify if the email in the token matches the email in the header
     if not verify_email_in_request(token_email, request):
@@ -266,49 +561,55 @@ async def list_agents(
             detail="Email in token doesn't match the provided email"
         )
     
-    agents_dir = os.path.join(os.path.dirname(__file__), "agents")
-    agent_files = glob.glob(os.path.join(agents_dir, "*_agent.py"))
+    # A changed agents directory means a rescan plus module imports; keep them off the loop
+    return await asyncio.to_thread(_agents_response)
+
+
+AGENTS_DIR = os.path.join(os.path.dirname(__file__), "agents")
+
+# (directory mtime, agent file paths) from the last scan of AGENTS_DIR
+_agent_dir_cache: Optional[Tuple[int, List[str]]] = None
+
+def _list_agent_files() -> List[str]:
+    """Return the agent module paths, re-scanning only when the directory changes."""
+    global _agent_dir_cache
+    
+    mtime = os.stat(AGENTS_DIR).st_mtime_ns
+    if _agent_dir_cache and _agent_dir_cache[0] == mtime:
+        return _agent_dir_cache[1]
     
     # Filter out __init__.py and base_agent.py
-    excluded_files = ["__init__.py", "base_agent.py"]
-    agent_files = [f for f in agent_files if os.path.basename(f) not in excluded_files]
+    excluded_files = {"__init__.py", "base_agent.py"}
+    with os.scandir(AGENTS_DIR) as entries:
+        agent_files = [
+            entry.path for entry in entries
+            if entry.name.endswith("_agent.py")
+            and entry.name not in excluded_files
+            and entry.is_file()
+        ]
+    
+    _agent_dir_cache = (mtime, agent_files)
+    return agent_files
+
+
+# (agent file list it was built from, payload) for the /agents endpoint
+_agents_response_cache: Optional[Tuple[List[str], Dict[str, Any]]] = None
+
+def _agents_response() -> Dict[str, Any]:
+    """Return the /agents payload, rebuilt only when the agent files change."""
+    global _agents_response_cache
+    
+    agent_files = _list_agent_files()
+    # _list_agent_files hands back the same list object until the directory changes
+    if _agents_response_cache and _agents_response_cache[0] is agent_files:
+        return _agents_response_cache[1]
     
     agents = []
     for file_path in agent_files:
         filename = os.path.basename(file_path)
         agent_name = filename.replace(".py", "")
         
-        # Try to get description from the agent class
-        try:
-            # Import the agent module dynamically
-            module_name = f"agents.{agent_name}"
-            module = __import__(module_name, fromlist=[agent_name])
-            
-            # Get the agent class (assumes class name follows CamelCase convention)
-            class_name = ''.join(word.capitalize() for word in agent_name.split('_'))
-            agent_class = getattr(module, class_name)
-            
-            # Create instance to get description
-            agent_instance = agent_class()
-            description = agent_instance.description
-            
-            # Determine agent type based on name or description
-            agent_type = "unknown"
-            if "tool" in agent_name.lower() or "tool" in description.lower():
-                agent_type = "tool_enabled"
-            elif "llm" in description.lower() or "general" in agent_name.lower():
-                agent_type = "llm_powered"
-            elif "langflow" in agent_name.lower():
-                agent_type = "langflow"
-            elif "langgraph" in agent_name.lower():
-                agent_type = "langgraph"
-            elif "unknown" in agent_name.lower():
-                agent_type = "fallback"
-            
-        except Exception as e:
-            logger.warning(f"Could not load agent {agent_name}: {str(e)}")
-            description = f"Agent from {filename}"
-            agent_type = "unknown"
+        description, agent_type = _load_agent_meta(agent_name)
         
         agents.append({
             "name": agent_name,
@@ -317,11 +618,99 @@ async def list_agents(
             "file": filename
         })
     
-    return {
+    response = {
         "agents": agents,
         "total_agents": len(agents),
-        "scanned_from": agents_dir
+        "scanned_from": AGENTS_DIR
     }
+    _agents_response_cache = (agent_files, response)
+    return response
+
+
+@app.on_event("startup")
+async def _preload_agents():
+    """Scan and import the agents at boot so /agents never pays for it on a request."""
+    _agents_response()
+
+
+# (name substring, description substring, type), first match wins
+_AGENT_TYPE_RULES: Tuple[Tuple[str, Optional[str], str], ...] = (
+    ("tool", "tool", "tool_enabled"),
+    ("general", "llm", "llm_powered"),
+    ("langflow", None, "langflow"),
+    ("langgraph", None, "langgraph"),
+    ("unknown", None, "fallback"),
+)
+
+def _classify_agent(agent_name: str, description: str) -> str:
+    """Determine the agent type from its name or description."""
+    name = agent_name.lower()
+    description = description.lower()
+    for name_key, description_key, agent_type in _AGENT_TYPE_RULES:
+        if name_key in name or (description_key is not None and description_key in description):
+            return agent_type
+    return "unknown"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_agent_meta(agent_name: str) -> Tuple[str, str]:
+    """
+    Import an agent module once and return its (description, type).
+    
+    Agent modules don't change while the service runs, so the import, the
+    throwaway instance and the type classification happen at most once per name.
+    """
+    filename = f"{agent_name}.py"
+    # Try to get description from the agent class
+    try:
+        # Import the agent module dynamically, reusing it if already loaded
+        module_name = f"agents.{agent_name}"
+        module = sys.modules.get(module_name) or importlib.import_module(module_name)
+        
+        # Get the agent class (assumes class name follows CamelCase convention)
+        class_name = agent_name.title().replace("_", "")
+        agent_class = getattr(module, class_name)
+        
+        # Create instance to get description
+        agent_instance = agent_class()
+        description = agent_instance.description
+        
+        agent_type = _classify_agent(agent_name, description)
+        
+    except Exception as e:
+        logger.warning(f"Could not load agent {agent_name}: {str(e)}")
+        description = f"Agent from {filename}"
+        agent_type = "unknown"
+    
+    return description, agent_type
+
+
+GMAIL_CREDENTIALS_FILE = 'gmail_credentials.json'
+
+# (file mtime, parsed credentials) from the last read of GMAIL_CREDENTIALS_FILE
+_gmail_credentials_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+
+def _read_gmail_credentials() -> Optional[Dict[str, Any]]:
+    """Return the stored Gmail credentials, re-reading the file only when it changes."""
+    global _gmail_credentials_cache
+    
+    try:
+        mtime = os.stat(GMAIL_CREDENTIALS_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    
+    if _gmail_credentials_cache and _gmail_credentials_cache[0] == mtime:
+        return _gmail_credentials_cache[1]
+    
+    with open(GMAIL_CREDENTIALS_FILE, 'rb') as f:
+        credentials = orjson.loads(f.read())
+    _gmail_credentials_cache = (mtime, credentials)
+    return credentials
+
+def _write_gmail_credentials(credentials: Dict[str, Any]) -> None:
+    """Persist the Gmail credentials; the next read picks them up via the new mtime."""
+    with open(GMAIL_CREDENTIALS_FILE, 'wb') as f:
+        f.write(orjson.dumps(credentials, option=orjson.OPT_INDENT_2))
 
 
 @app.get("/integrations/gmail", response_model=GmailLoginResponse)
@@ -332,7 +721,7 @@ async def gmail_login():
     """
     try:
         # Verifica se o arquivo client_secrets.json existe
-        if not os.path.exists('client_secrets.json'):
+        if not await asyncio.to_thread(os.path.exists, 'client_secrets.json'):
             return GmailLoginResponse(
                 authorization_url="",
                 state="",
@@ -340,7 +729,8 @@ async def gmail_login():
             )
         
         # Inicia o processo de login
-        auth_url, state = iniciar_login()
+        # Reads client_secrets.json, so it runs in a thread like the rest of the Gmail I/O
+        auth_url, state = await asyncio.to_thread(iniciar_login)
         
         return GmailLoginResponse(
             authorization_url=auth_url,
@@ -368,7 +758,8 @@ async def gmail_callback(code: str = Query(...), state: str = Query(...)):
         callback_url = f"http://localhost:8000/gmail/callback?code={code}&state={state}"
         
         # Processa o callback e obtém as credenciais
-        credentials = receber_callback(callback_url)
+        # The token exchange is a blocking HTTP call to Google
+        credentials = await asyncio.to_thread(receber_callback, callback_url)
         
         if credentials:
             # Armazena as credenciais em um arquivo para uso posterior
@@ -382,8 +773,8 @@ async def gmail_callback(code: str = Query(...), state: str = Query(...)):
                 'expiry': credentials.expiry.isoformat() if credentials.expiry else None
             }
             
-            with open('gmail_credentials.json', 'w') as f:
-                json.dump(credentials_json, f, indent=2)
+            # Plain file I/O would block the event loop for every other request
+            await asyncio.to_thread(_write_gmail_credentials, credentials_json)
             
             return GmailCallbackResponse(
                 success=True,
@@ -408,13 +799,11 @@ async def gmail_callback(code: str = Query(...), state: str = Query(...)):
 @app.get("/integrations/gmail/status")
 async def gmail_status():
     """
-    Verifica o sta", retus da conexão com Gmail.
+    Verifica o status da conexão com Gmail.
     """
     try:
-        if os.path.exists('gmail_credentials.json'):
-            with open('gmail_credentials.json', 'r') as f:
-                credentials = json.load(f)
-            
+        credentials = await asyncio.to_thread(_read_gmail_credentials)
+        if credentials is not None:
             return {
                 "connected": True,
                 "message": "Conectado ao Gmail",
@@ -442,9 +831,9 @@ async def gmail_status():
 async def list_langflow_flows():
     """List available LangFlow workflows."""
     try:
-        from llm_integration import LangFlowManager
-        langflow_manager = LangFlowManager()
-        flows = await langflow_manager.get_available_flows()
+        if langflow_manager is None:
+            raise RuntimeError("LangFlow integration not available")
+        flows = await _cached_flows()
         return {
             "flows": flows,
             "total_flows": len(flows),
@@ -475,6 +864,30 @@ class UserResponse(BaseModel):
     picture: Optional[str] = None
     is_active: bool = True
 
+def _user_data(user: Account) -> Dict[str, Any]:
+    """Public fields of an account, as returned by the auth endpoints."""
+    user_data = {
+        "email": user.email,
+        "name": user.name,
+        "is_active": user.is_active
+    }
+    if user.picture:
+        user_data["picture"] = user.picture
+    return user_data
+
+def _token_response(user: Account) -> Dict[str, Any]:
+    """Issue a JWT for user and build the Token response body."""
+    access_token = create_access_token(
+        data={"sub": user.email, "email": user.email},
+        expires_delta=ACCESS_TOKEN_EXPIRES
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRES_SECONDS,
+        "user": _user_data(user)
+    }
+
 @app.get("/auth/google/login", tags=["Authentication"])
 async def login_google(request: Request):
     """
@@ -502,7 +915,7 @@ async def login_google(request: Request):
 @app.get("/auth/google/callback", response_model=Token, tags=["Authentication"])
 async def auth_google_callback(
     request: Request, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Callback para autenticação com Google.
@@ -526,45 +939,8 @@ async def auth_google_callback(
                 detail="Could not get user email from Google"
             )
         
-        # Get or create user in database
-        user = db.query(Account).filter(Account.email == user_info['email']).first()
-        if not user:
-            # Create new user if not exists
-            user = Account(
-                email=user_info['email'],
-                name=user_info.get('name', user_info['email'].split('@')[0]),
-                picture=user_info.get('picture'),
-                is_active=True,
-                oauth_provider='google',
-                oauth_id=user_info.get('sub')
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-        
-        # Create JWT token
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user.email, "email": user.email},
-            expires_delta=access_token_expires
-        )
-        
-        # Prepare user data for response
-        user_data = {
-            "email": user.email,
-            "name": user.name,
-            "is_active": user.is_active
-        }
-        if user.picture:
-            user_data["picture"] = user.picture
-        
-        # Return the token and user info
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "expires_in": int(access_token_expires.total_seconds()),
-            "user": user_data
-        }
+        user = await get_or_create_oauth_account(db, 'google', user_info['email'], user_info.get('sub'), user_info)
+        return _token_response(user)
         
     except HTTPException:
         raise
@@ -579,7 +955,7 @@ async def auth_google_callback(
 async def get_current_user(
     request: Request,
     authorization: str = Header(..., description="JWT token in format 'Bearer <token>'"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current authenticated user information.
@@ -597,7 +973,7 @@ async def get_current_user(
         token = authorization.split(" ")[1]
         
         # Verify token and get user email
-        payload = verify_jwt_token(token)
+        payload = verify_cached(token, verify_jwt_token)
         if not payload or "email" not in payload:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -605,23 +981,21 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        user_data = user_records.get(payload["email"])
+        if user_data is not None:
+            return user_data
+        
         # Get user from database
-        user = db.query(Account).filter(Account.email == payload["email"]).first()
+        result = await db.execute(select(Account).where(Account.email == payload["email"]))
+        user = result.scalar_one_or_none()
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        # Return user data
-        user_data = {
-            "email": user.email,
-            "name": user.name,
-            "is_active": user.is_active
-        }
-        if user.picture:
-            user_data["picture"] = user.picture
-            
+        user_data = _user_data(user)
+        user_records.set(payload["email"], user_data)
         return user_data
         
     except HTTPException:
@@ -662,7 +1036,7 @@ async def login_apple(request: Request):
 @app.post('/auth/apple/callback', response_model=Token, tags=["Authentication"])
 async def auth_apple_callback(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Callback para autenticação com Apple.
@@ -693,45 +1067,8 @@ async def auth_apple_callback(
                 detail="Email is required but not provided by Apple"
             )
         
-        # Get or create user in database
-        user = db.query(Account).filter(Account.email == email).first()
-        if not user:
-            # Create new user if not exists
-            user = Account(
-                email=email,
-                name=user_info.get('name', email.split('@')[0]),
-                picture=user_info.get('picture'),
-                is_active=True,
-                oauth_provider='apple',
-                oauth_id=user_info['sub']
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-        
-        # Create JWT token
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user.email, "email": user.email},
-            expires_delta=access_token_expires
-        )
-        
-        # Prepare user data for response
-        user_data = {
-            "email": user.email,
-            "name": user.name,
-            "is_active": user.is_active
-        }
-        if user.picture:
-            user_data["picture"] = user.picture
-        
-        # Return the token and user info
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "expires_in": int(access_token_expires.total_seconds()),
-            "user": user_data
-        }
+        user = await get_or_create_oauth_account(db, 'apple', email, user_info['sub'], user_info)
+        return _token_response(user)
         
     except HTTPException:
         raise
@@ -749,25 +1086,37 @@ async def get_test_token(email: str):
     Generate a test JWT token for development.
     WARNING: This is for development use only! Remove in production.
     """
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": email, "email": email},
-        expires_delta=access_token_expires
+        expires_delta=ACCESS_TOKEN_EXPIRES
     )
     
     return {
         "access_token": access_token,
         "token_type": "bearer",
         "email": email,
-        "expires_in": int(access_token_expires.total_seconds())
+        "expires_in": ACCESS_TOKEN_EXPIRES_SECONDS
     }
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "api:app",
-        host="0.0.0.0",
-        port=8080,
-        reload=True,
-        log_level="info"
-    )
+    if os.getenv("ENVIRONMENT") == "production":
+        # Conversation memory, jobs and caches live in-process, so workers
+        # only scale out when WEB_CONCURRENCY is raised deliberately
+        uvicorn.run(
+            "api:app",
+            host="0.0.0.0",
+            port=8080,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            loop="uvloop",
+            http="httptools",
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "api:app",
+            host="0.0.0.0",
+            port=8080,
+            reload=True,
+            log_level="info"
+        )
@@ -1,5 +1,9 @@
 import os
+import hmac
+import base64
+import hashlib
 import jwt
+import orjson
 import datetime
 from datetime import timedelta
 from typing import Optional
@@ -23,7 +27,22 @@ oauth = OAuth()
 # JWT Configuration
 JWT_SECRET = os.getenv("JWT_SECRET_KEY", "default-secret-key")
 JWT_ALGORITHM = "HS256"
+# Key bytes and algorithm list are built once instead of on every encode/decode.
+# HS256 is cheap enough to sign inline; an asymmetric algorithm (RS256/ES256)
+# should move to asyncio.to_thread in the async handlers.
+_JWT_KEY = JWT_SECRET.encode()
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+# Every token we issue carries exp, so its presence is enforced too
+_JWT_DECODE_OPTIONS = {"require": ["exp"]}
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+_UTC = datetime.timezone.utc
+_DEFAULT_TOKEN_TTL = timedelta(minutes=15)
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# The HS256 header never changes, so its encoded form is the fixed start of every token
+_JWT_SIGNING_PREFIX = _b64url(orjson.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"})) + b"."
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -37,13 +56,27 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         str: Encoded JWT token
     """
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
-    return encoded_jwt
+    expire = datetime.datetime.now(_UTC) + (expires_delta or _DEFAULT_TOKEN_TTL)
+    to_encode["exp"] = int(expire.timestamp())
+    # Signed by hand: only the payload varies, and decode_token verifies it like any PyJWT token
+    signing_input = _JWT_SIGNING_PREFIX + _b64url(orjson.dumps(to_encode))
+    signature = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url(signature)).decode()
+
+def decode_token(token: str) -> dict:
+    """
+    Verify a JWT's signature and expiry and return its payload.
+    
+    Args:
+        token: The JWT token to decode
+        
+    Returns:
+        dict: The decoded token payload
+        
+    Raises:
+        jwt.PyJWTError: If the token is invalid or expired
+    """
+    return jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_DECODE_OPTIONS)
 
 def verify_jwt_token(token: str) -> Optional[dict]:
     """
@@ -56,8 +89,7 @@ def verify_jwt_token(token: str) -> Optional[dict]:
         Optional[dict]: The decoded token payload if valid, None otherwise
     """
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
+        return decode_token(token)
     except jwt.PyJWTError:
         return None
 
@@ -1,6 +1,10 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from .models import Account, Integration
-from typing import Optional
+from typing import Any, Dict, Optional
 
 def get_user_by_email(db: Session, email: str) -> Optional[Account]:
     """
@@ -31,3 +35,73 @@ def get_service_integration(db: Session, email: str, service: str="github") -> O
         .filter(Account.email == email, Integration.service == service)
         .first()
     )
+
+
+# Dialects whose INSERT supports ON CONFLICT ... RETURNING
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+async def _get_account_by_identity(db: AsyncSession, provider: str, oauth_id: str) -> Optional[Account]:
+    result = await db.execute(
+        select(Account).where(Account.oauth_provider == provider, Account.oauth_id == oauth_id)
+    )
+    return result.scalar_one_or_none()
+
+async def get_or_create_oauth_account(
+    db: AsyncSession,
+    provider: str,
+    email: str,
+    oauth_id: Optional[str],
+    user_info: Dict[str, Any]
+) -> Account:
+    """
+    Return the account for an OAuth login, creating it from the provider's user info if new.
+
+    The provider identity (oauth_provider, oauth_id) is checked first through its
+    index, so an account whose email changed at the provider is still found.
+    Unknown identities are upserted on email in one statement where supported.
+    """
+    if oauth_id:
+        user = await _get_account_by_identity(db, provider, oauth_id)
+        if user is not None:
+            return user
+
+    values = {
+        "email": email,
+        "name": user_info.get('name', email.split('@')[0]),
+        "picture": user_info.get('picture'),
+        "is_active": True,
+        "oauth_provider": provider,
+        "oauth_id": oauth_id
+    }
+
+    try:
+        insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+        if insert is not None:
+            # Insert, or on an existing email touch nothing and return the row
+            stmt = insert(Account).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Account.email],
+                set_={"email": stmt.excluded.email}
+            ).returning(Account)
+            user = (await db.execute(stmt)).scalar_one()
+            await db.commit()
+            return user
+
+        result = await db.execute(select(Account).where(Account.email == email))
+        user = result.scalar_one_or_none()
+        if not user:
+            user = Account(**values)
+            db.add(user)
+            await db.commit()
+            await db.refresh(user)
+        return user
+    except IntegrityError:
+        # A concurrent first login with the same identity inserted it first
+        await db.rollback()
+        user = await _get_account_by_identity(db, provider, oauth_id) if oauth_id else None
+        if user is None:
+            raise
+        return user
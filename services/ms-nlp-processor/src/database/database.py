@@ -1,13 +1,48 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from .models import Base
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./samantha_users.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+def _engine_options(url: str) -> dict:
+    """Build pool settings for the engine; DB_DISABLE_POOL switches to NullPool."""
+    options = {"pool_pre_ping": True}
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+
+    if os.getenv("DB_DISABLE_POOL"):
+        # One-shot scripts shouldn't keep connections open after they finish
+        options["poolclass"] = NullPool
+    elif not url.startswith("sqlite"):
+        options.update(
+            pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "30")),
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        )
+    return options
+
+def _async_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart."""
+    for prefix, async_prefix in (
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+    ):
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for request handlers, so queries yield the event loop
+async_engine = create_async_engine(_async_url(DATABASE_URL), **_engine_options(DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 def init_db():
     Base.metadata.create_all(bind=engine)
 
@@ -17,3 +52,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -6,6 +6,10 @@ Base = declarative_base()
 
 class Account(Base):
     __tablename__ = 'account'
+    # email already carries its own unique index; OAuth callbacks look users up by either
+    __table_args__ = (
+        Index('ix_account_provider_oauth_id', 'oauth_provider', 'oauth_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     email = Column(String, unique=True, index=True, nullable=False)
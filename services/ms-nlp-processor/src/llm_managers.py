@@ -1,12 +1,14 @@
 """
 LLM Managers module
 """
+import os
+import asyncio
 import logging
 
 from datetime import datetime
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 
 from pydantic import BaseModel, field_validator, ValidationError, Field
 from tools.gmail_tool import GmailTool
@@ -104,19 +106,32 @@ class LLMManager(BaseLLMManager):
         }
 
 
+def _chunk_text(content: Any) -> str:
+    """Text of a message chunk; Anthropic models send a list of content blocks instead of a str."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") for block in content
+            if isinstance(block, dict) and block.get("type") == "text"
+        )
+    return ""
+
+
 class LangGraphManager(BaseLLMManager):
     """Manages LangGraph workflows for multi-agent coordination."""
     
     def __init__(self, preferred_provider: LLMProvider = LLMProvider.GEMINI):
         super().__init__(preferred_provider)
         
-        # Initialize tools
+        # Initialize tools; the note tools are class-level, so one instance serves all three
+        notes_tool = ObsidianGitHubTool()
         tools = [
             GmailTool().search_gmail_dynamic,
             WebSearchTool().execute,
-            ObsidianGitHubTool(next(get_db())).search_notes,
-            ObsidianGitHubTool(next(get_db())).read_note,
-            ObsidianGitHubTool(next(get_db())).create_or_update_note
+            notes_tool.search_notes,
+            notes_tool.read_note,
+            notes_tool.create_or_update_note
         ]
 
         # Pass the state to the tools so they can access dynamic data like vault_path
@@ -136,8 +151,13 @@ class LangGraphManager(BaseLLMManager):
         ]
 
         self.supervisor_prompt = LangGraphManager.build_prompt(self.registred_agents, tools)
+        # Built once so every routing call starts with the same, cacheable prefix
+        self.supervisor_message = self.current_provider.system_message(self.supervisor_prompt)
         self.route_choices = self._compute_route_choices()
         self.route_response_model = self._build_route_response_model()
+        # Structured-output wrapper is built once; routing is a small classification,
+        # so it can run on a cheaper model than the agents (ROUTER_LLM_MODEL)
+        self.router_chain = self._build_router_client().with_structured_output(self.route_response_model)
 
         # Create and compile the workflow
         self.workflow = self._create_workflow()
@@ -244,6 +264,22 @@ class LangGraphManager(BaseLLMManager):
 
         return RouteResponse
 
+    def _build_router_client(self):
+        """Return the chat model used by the supervisor to pick the next node."""
+        router_model = os.getenv("ROUTER_LLM_MODEL")
+        if not router_model or router_model == self.current_provider.config.model:
+            return self.current_provider.client
+
+        try:
+            # Routing output must be stable, so the router runs without sampling
+            config = LLMConfig(self.current_provider.config.provider, model=router_model, temperature=0)
+            provider = LLMProviderFactory.create_provider(config)
+            logger.info(f"Supervisor routing with {config.provider.value}/{router_model}")
+            return provider.client
+        except Exception as e:
+            logger.warning(f"Failed to initialize router model {router_model}, using the default one: {str(e)}")
+            return self.current_provider.client
+
     def _supervisor_condition(self, state: AgentState): 
         return state["next"]
 
@@ -301,13 +337,11 @@ class LangGraphManager(BaseLLMManager):
         logger.info(f"_supervisor_node preparing state for user: {state.get('user_email')} text: {state.get('text')}")
      
         # Isso substitui a necessidade de tools_condition
-        chain = self.current_provider.client.with_structured_output(self.route_response_model)
-    
         # Adicionamos o prompt do sistema antes das mensagens atuais do usuário
-        messages = [SystemMessage(content=self.supervisor_prompt)] + state.get("messages", [])
+        messages = [self.supervisor_message, *state.get("messages", [])]
 
         try:
-            response = chain.invoke(messages)
+            response = await self.router_chain.ainvoke(messages)
             return {
                 "next": response.next,
                 "messages": AIMessage(content=response.instructions)
@@ -341,8 +375,8 @@ class LangGraphManager(BaseLLMManager):
     
     async def _check_user_node(self, state: AgentState) -> AgentState:
         """Check if the user exists and load their vault path and GitHub config."""
-        db = next(get_db())
-        user = get_user_by_email(db, state["user_email"])
+        # The sync database session would otherwise block the event loop
+        user = await asyncio.to_thread(get_user_by_email, next(get_db()), state["user_email"])
         updates: Dict[str, Any] = {}
         if user:
             updates["is_authenticated"] = True
@@ -390,7 +424,6 @@ class LangGraphManager(BaseLLMManager):
 
     async def _handle_notes_path_update_node(self, state: AgentState) -> AgentState:
         """Node to update the notes_path in the database."""
-        db = next(get_db())
         # simple extraction of the path from the text
         notes_path = self._get_latest_text(state).strip()
         
@@ -401,7 +434,7 @@ class LangGraphManager(BaseLLMManager):
             self._log_state_snapshot("_handle_notes_path_update_node", updates)
             return updates
         
-        update_user_notes_path(db, state["user_email"], notes_path)
+        await asyncio.to_thread(update_user_notes_path, next(get_db()), state["user_email"], notes_path)
         response_message = f"Caminho das notas atualizado para: {notes_path}. Agora podemos continuar."
         updates = {
             "notes_path": notes_path,
@@ -410,29 +443,42 @@ class LangGraphManager(BaseLLMManager):
         self._log_state_snapshot("_handle_notes_path_update_node", updates)
         return updates
 
-    async def process_text(self, text: str, thread_id: str = "default", email: str = None) -> Dict[str, Any]:
-        """Process text using the LangGraph workflow."""
-        try:            
-            #TODO: Passar a validação de configurações iniciais pra ca
-            initial_state = AgentState(
-                messages=[HumanMessage(content=text)],  # Add the initial user message
-                text=text,
-                user_email=email,
-                is_authenticated=bool(email),  # Simple auth check
-                entities={},
-                response=[],
-                metadata={"timestamp": datetime.utcnow().isoformat()},
-            )
+    def _initial_state(self, text: str, email: Optional[str]) -> AgentState:
+        """Build the state a new turn enters the workflow with."""
+        #TODO: Passar a validação de configurações iniciais pra ca
+        return AgentState(
+            messages=[HumanMessage(content=text)],  # Add the initial user message
+            text=text,
+            user_email=email,
+            is_authenticated=bool(email),  # Simple auth check
+            entities={},
+            response=[],
+            metadata={"timestamp": datetime.utcnow().isoformat()},
+        )
 
-            # The config is passed to all nodes. The vault_path will be populated
-            # by the _check_user_node and will be available in the state for subsequent nodes.
-            config = {
-                "recursion_limit": 20,
-                "configurable": {
-                    "thread_id": thread_id
-                }, 
-            }
-            result = await self.app.ainvoke(initial_state, config)
+    def _run_config(self, thread_id: str) -> Dict[str, Any]:
+        """Build the run config for a thread.
+
+        The config is passed to all nodes. The vault_path will be populated
+        by the _check_user_node and will be available in the state for subsequent nodes.
+        """
+        return {
+            "recursion_limit": 20,
+            "configurable": {
+                "thread_id": thread_id
+            },
+        }
+
+    async def _forget_thread(self, thread_id: str) -> None:
+        """Drop every checkpoint of a thread, so turns run without history leave nothing behind."""
+        await self.app.checkpointer.adelete_thread(thread_id)
+
+    async def process_text(
+        self, text: str, thread_id: str = "default", email: str = None, history: bool = True
+    ) -> Dict[str, Any]:
+        """Process text using the LangGraph workflow; history=False forgets the thread afterwards."""
+        try:            
+            result = await self.app.ainvoke(self._initial_state(text, email), self._run_config(thread_id))
 
             # Get the last message content from the state
             response = result.get("response", [])
@@ -465,7 +511,46 @@ class LangGraphManager(BaseLLMManager):
                 "thread_id": thread_id,
                 "error": str(e),
             }
+        finally:
+            if not history:
+                await self._forget_thread(thread_id)
     
+    async def stream_text(
+        self, text: str, thread_id: str = "default", email: str = None, history: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Run the workflow and yield the final answer as the synthesizer generates it.
+
+        Tokens are taken from LangGraph's "messages" stream, which LangChain feeds
+        while the synthesizer's ainvoke call is still generating. Turns that end in
+        another node (auth or configuration prompts) yield their response once.
+        With history=False the thread is forgotten once the turn is over.
+        """
+        config = self._run_config(thread_id)
+        streamed = False
+        try:
+            async for chunk, metadata in self.app.astream(
+                self._initial_state(text, email), config, stream_mode="messages"
+            ):
+                if metadata.get("langgraph_node") != SynthesizerAgent.AGENT_NAME:
+                    continue
+                token = _chunk_text(chunk.content)
+                if token:
+                    streamed = True
+                    yield token
+
+            if not streamed:
+                snapshot = await self.app.aget_state(config)
+                response = snapshot.values.get("response") if snapshot else None
+                yield getattr(response, "content", None) or "A mensagem estava vazia, aconteceu algum problema!"
+
+        except Exception as e:
+            logger.error(f"Error in LangGraph streaming: {str(e)}", exc_info=True)
+            yield "Desculpe, ocorreu um erro no processamento com LangGraph."
+        finally:
+            if not history:
+                await self._forget_thread(thread_id)
+
     async def get_conversation_history(self, thread_id: str = "default") -> List[Dict[str, Any]]:
         """Get conversation history for a thread."""
         try:
@@ -5,7 +5,7 @@ import os
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, SystemMessage
 from enum import Enum
 
 from dotenv import load_dotenv
@@ -78,6 +78,10 @@ class BaseLLMProvider(ABC):
     def execute(self, messages: List[BaseMessage]):
         return self.client.invoke(messages)
 
+    def system_message(self, content: str) -> SystemMessage:
+        """Wrap a static system prompt in the provider's preferred message form."""
+        return SystemMessage(content=content)
+
     @abstractmethod
     def _initialize_client(self):
         """Initialize the LLM client."""
@@ -150,6 +154,12 @@ class ClaudeProvider(BaseLLMProvider):
             max_tokens=self.config.max_tokens,
             anthropic_api_key=self.config.api_key
         )
+
+    def system_message(self, content: str) -> SystemMessage:
+        """Mark the static prompt as cacheable so repeat calls read it from Anthropic's prompt cache."""
+        return SystemMessage(
+            content=[{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
+        )
     
     def is_available(self) -> bool:
         """Check if Claude is available."""
@@ -0,0 +1,88 @@
+"""
+In-process job queue behind /process/async.
+
+A fixed pool of asyncio workers drains the queue so the request that submits
+a job returns right away instead of waiting on the LLM. Finished jobs are kept
+for polling until the table is full; pending jobs are never evicted.
+"""
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+ERROR = "error"
+
+
+class JobQueueFull(Exception):
+    """Raised when every slot in the job table holds a job that hasn't finished."""
+
+
+class JobQueue:
+    """Bounded table of background jobs, each visible only to the user who submitted it."""
+
+    def __init__(self, max_jobs: int = 1024):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+
+    def start(self, worker_count: int) -> None:
+        """Start worker_count workers on the running loop."""
+        self._workers.extend(asyncio.create_task(self._work()) for _ in range(worker_count))
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    def submit(self, owner: str, run: Callable[[], Awaitable[Any]]) -> str:
+        """
+        Queue run() and return the new job's id.
+
+        Raises:
+            JobQueueFull: If the table is full and no finished job can be dropped
+        """
+        if len(self._jobs) >= self.max_jobs:
+            self._evict_finished()
+            if len(self._jobs) >= self.max_jobs:
+                raise JobQueueFull()
+
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = {"status": PENDING, "owner": owner}
+        self._queue.put_nowait((job_id, run))
+        return job_id
+
+    def get(self, job_id: str, owner: str) -> Optional[Dict[str, Any]]:
+        """Return the job if it exists and belongs to owner."""
+        job = self._jobs.get(job_id)
+        if job is None or job["owner"] != owner:
+            return None
+        return job
+
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished job, if there is one."""
+        for job_id, job in self._jobs.items():
+            if job["status"] != PENDING:
+                del self._jobs[job_id]
+                return
+
+    async def _work(self) -> None:
+        """Run queued jobs one at a time, storing each outcome on its job."""
+        while True:
+            job_id, run = await self._queue.get()
+            job = self._jobs[job_id]
+            try:
+                job["result"] = await run()
+                job["status"] = DONE
+            except Exception as e:
+                logger.error(f"Error processing job {job_id}: {str(e)}", exc_info=True)
+                job["error"] = str(e)
+                job["status"] = ERROR
+            finally:
+                self._queue.task_done()
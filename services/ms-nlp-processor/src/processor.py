@@ -7,8 +7,9 @@ using LLM, LangFlow, and LangGraph for intelligent multi-agent decision making.
 
 import logging
 
-from typing import Dict, Any, List
-from llm_managers import LLMManager, LangGraphManager
+from typing import AsyncIterator, Dict, Any, List
+from langchain_core.messages import HumanMessage, SystemMessage
+from registry import llm_manager, langgraph_manager
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +17,13 @@ class NLPProcessor:
     """Main NLP processor that coordinates different agents using LLM, LangFlow, and LangGraph."""
     
     def __init__(self):
-        self.llm_manager = LLMManager()
-        self.langgraph_manager = LangGraphManager()
+        self.llm_manager = llm_manager()
+        self.langgraph_manager = langgraph_manager()
         
     
-    async def process_text(self, text: str, thread_id: str = "default", email: str = None) -> Dict[str, Any]:
+    async def process_text(
+        self, text: str, thread_id: str = "default", email: str = None, history: bool = True
+    ) -> Dict[str, Any]:
         """
         Process the input text through intelligent engine selection.
         
@@ -28,6 +31,7 @@ class NLPProcessor:
             text: The input text to process
             thread_id: Thread ID for conversation continuity
             email: The user's email for authentication
+            history: False to forget the thread once the turn is over
 
         Returns:
             Dict containing the response and metadata
@@ -41,7 +45,7 @@ class NLPProcessor:
 
             # Execute using the selected method
             if processing_method == "langgraph":
-                return await self.langgraph_manager.process_text(text, thread_id, email)
+                return await self.langgraph_manager.process_text(text, thread_id, email, history)
             else:
                 return await self.llm_manager.process_text(text, thread_id)
                 
@@ -55,11 +59,27 @@ class NLPProcessor:
                 "processing_method": "error"
             }
     
+    def stream_text(
+        self, text: str, thread_id: str = "default", email: str = None, history: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Stream the response text for the input as it is generated.
+        
+        Args:
+            text: The input text to process
+            thread_id: Thread ID for conversation continuity
+            email: The user's email for authentication
+            history: False to forget the thread once the turn is over
+
+        Returns:
+            Async iterator over chunks of the response text
+        """
+        # Streaming is only wired through LangGraph, the method process_text forces today
+        return self.langgraph_manager.stream_text(text, thread_id, email, history)
+    
     async def _select_processing_method(self, text: str, thread_id: str) -> str:
         """Use LLM to select the best processing method."""
         try:
-            from langchain.schema import HumanMessage, SystemMessage
-            
             prompt = f"""
             Analise a solicitação do usuário e selecione o melhor método de processamento:
             
@@ -0,0 +1,21 @@
+"""
+Process-wide registry for the managers shared by the NLP service.
+
+Managers hold LLM clients, compiled LangGraph workflows and tool instances,
+so every caller should reuse one instance instead of building its own.
+"""
+import functools
+
+from llm_managers import LLMManager, LangGraphManager
+
+
+@functools.cache
+def llm_manager() -> LLMManager:
+    """Return the shared LLMManager, creating it on first use."""
+    return LLMManager()
+
+
+@functools.cache
+def langgraph_manager() -> LangGraphManager:
+    """Return the shared LangGraphManager, creating it on first use."""
+    return LangGraphManager()
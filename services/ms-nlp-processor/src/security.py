@@ -1,14 +1,11 @@
 import jwt
-from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from fastapi import HTTPException, status, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
 
-# Load environment variables
-JWT_SECRET = os.getenv("JWT_SECRET_KEY", "default-secret-key")
-JWT_ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+from auth import decode_token
+from token_cache import verify_cached
 
 class JWTBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
@@ -37,16 +34,6 @@ class JWTBearer(HTTPBearer):
             
         return payload
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
-    return encoded_jwt
-
 def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
     # In development, accept any non-empty token
     if os.getenv('ENVIRONMENT') != 'production':
@@ -59,8 +46,7 @@ def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
         
     # In production, validate the token properly
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
+        return decode_token(token)
     except jwt.PyJWTError:
         return None
 
@@ -74,7 +60,7 @@ def get_current_user_email(request: Request) -> str:
         )
     
     token = auth_header.split(" ")[1]
-    payload = verify_jwt_token(token)
+    payload = verify_cached(token, verify_jwt_token)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -92,6 +78,10 @@ def get_current_user_email(request: Request) -> str:
     
     return email
 
+async def current_user_email(request: Request) -> str:
+    """FastAPI dependency wrapper; being async, it runs without a threadpool hop."""
+    return get_current_user_email(request)
+
 def verify_email_in_request(email: str, request: Request) -> bool:
     request_email = request.headers.get("X-User-Email")
     if not request_email:
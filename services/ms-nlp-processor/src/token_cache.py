@@ -0,0 +1,88 @@
+"""
+Short-lived caches for authentication lookups.
+
+Clients resend the same bearer token on every call, so a verified payload is
+kept for AUTH_CACHE_TTL seconds (never past the token's own ``exp``) instead of
+checking the signature again on each request.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "5"))
+AUTH_CACHE_MAX = int(os.getenv("AUTH_CACHE_MAX", "10000"))
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the live value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """Store value, expiring after ttl or at expires_at, whichever is sooner."""
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._entries[key] = (deadline, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Verified JWT payloads keyed by the token's sha256 digest
+token_payloads = TTLCache(AUTH_CACHE_MAX, AUTH_CACHE_TTL)
+
+# /auth/me user data keyed by email, so repeat calls skip the database
+user_records = TTLCache(AUTH_CACHE_MAX, AUTH_CACHE_TTL)
+
+
+def verify_cached(
+    token: str,
+    verify: Callable[[str], Optional[Dict[str, Any]]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the payload for token, calling verify only on a cache miss.
+
+    Args:
+        token: The raw bearer token
+        verify: Function that validates the token and returns its payload or None
+
+    Returns:
+        The decoded payload, or None if the token is invalid (failures are not cached)
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_payloads.get(key)
+    if payload is None:
+        payload = verify(token)
+        if payload:
+            exp = payload.get("exp")
+            token_payloads.set(key, payload, exp if isinstance(exp, (int, float)) else None)
+    return payload
@@ -6,4 +6,6 @@ pwd
 python -c "from database.database import init_db; init_db()"
 
 # Start the application
-uvicorn api:app --host 0.0.0.0 --port 8080
+# uvloop/httptools for the event loop and HTTP parsing; WEB_CONCURRENCY > 1 splits
+# the in-process conversation memory between workers, so it defaults to one
+uvicorn api:app --host 0.0.0.0 --port 8080 --loop uvloop --http httptools --workers "${WEB_CONCURRENCY:-1}"
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 import sys
 import types
 
@@ -22,6 +23,8 @@ from typing import Any, Dict
 
 import pytest
 
+from agents.base_agent import BaseAgent  # noqa: E402
+import agents.utils as agents_utils  # noqa: E402
 from agents.utils import (  # noqa: E402
     collect_agent_descriptions,
     collect_tool_descriptions,
@@ -155,6 +158,30 @@ def test_collect_agent_descriptions_falls_back_to_docstring():
     ]
 
 
+def test_collect_agent_descriptions_reuses_class_docstring_summary(monkeypatch):
+    """Agents of the same class should only have their docstring parsed once."""
+
+    class SharedDocAgent(_StubAgent):
+        """Shared summary."""
+
+        def __init__(self, name: str):
+            super().__init__(name=name, description="")
+
+    calls = []
+    original = agents_utils._extract_docstring_summary
+
+    def counting_extract(obj):
+        calls.append(obj)
+        return original(obj)
+
+    monkeypatch.setattr(agents_utils, "_extract_docstring_summary", counting_extract)
+
+    descriptions = collect_agent_descriptions([SharedDocAgent("a"), SharedDocAgent("b")])
+
+    assert [entry["description"] for entry in descriptions] == ["Shared summary.", "Shared summary."]
+    assert calls == [SharedDocAgent]
+
+
 def test_collect_agent_descriptions_skips_when_missing_description(caplog):
     """Agents without description sources should be ignored."""
 
@@ -0,0 +1,39 @@
+"""Unit tests for the hand-signed access tokens in auth."""
+
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from auth import JWT_ALGORITHM, JWT_SECRET, create_access_token, decode_token
+
+
+def test_create_access_token_matches_pyjwt_encoding():
+    data = {"sub": "user@example.com", "email": "user@example.com"}
+    token = create_access_token(data, expires_delta=timedelta(minutes=30))
+
+    payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    assert payload["email"] == "user@example.com"
+    assert jwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+
+    expected = jwt.encode({**data, "exp": payload["exp"]}, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    assert token == expected
+
+
+def test_create_access_token_defaults_to_fifteen_minutes():
+    token = create_access_token({"sub": "user@example.com", "email": "user@example.com"})
+
+    exp = decode_token(token)["exp"]
+    assert 14 * 60 <= exp - time.time() <= 15 * 60 + 1
+
+
+def test_decode_token_rejects_tampered_signature():
+    token = create_access_token({"sub": "user@example.com", "email": "user@example.com"})
+    header, payload, signature = token.split(".")
+    tampered = ".".join([header, payload, signature[:-2] + ("AA" if signature[-2:] != "AA" else "BB")])
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        decode_token(tampered)
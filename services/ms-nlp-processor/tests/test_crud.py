@@ -0,0 +1,86 @@
+"""Unit tests for the OAuth account helpers in database.crud."""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database.crud import get_or_create_oauth_account
+from database.models import Account, Base
+
+
+def _run(scenario):
+    """Run scenario(session_factory) against a fresh in-memory SQLite database."""
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            return await scenario(async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+async def _count_accounts(sessions) -> int:
+    async with sessions() as db:
+        return (await db.execute(select(func.count()).select_from(Account))).scalar_one()
+
+
+def test_first_login_creates_account():
+    async def scenario(sessions):
+        async with sessions() as db:
+            user = await get_or_create_oauth_account(
+                db, "google", "a@x.com", "sub1", {"name": "Ana", "picture": "http://pic"}
+            )
+        return user, await _count_accounts(sessions)
+
+    user, count = _run(scenario)
+    assert (user.email, user.name, user.picture) == ("a@x.com", "Ana", "http://pic")
+    assert (user.oauth_provider, user.oauth_id) == ("google", "sub1")
+    assert count == 1
+
+
+def test_repeat_login_returns_existing_row_unchanged():
+    async def scenario(sessions):
+        async with sessions() as db:
+            first = await get_or_create_oauth_account(db, "google", "a@x.com", "sub1", {"name": "Ana"})
+        async with sessions() as db:
+            second = await get_or_create_oauth_account(db, "google", "a@x.com", "sub1", {"name": "Outro"})
+        return first, second, await _count_accounts(sessions)
+
+    first, second, count = _run(scenario)
+    assert second.id == first.id
+    assert second.name == "Ana"
+    assert count == 1
+
+
+def test_existing_email_without_identity_is_reused():
+    async def scenario(sessions):
+        async with sessions() as db:
+            db.add(Account(email="a@x.com", name="Ana", is_active=True))
+            await db.commit()
+        async with sessions() as db:
+            user = await get_or_create_oauth_account(db, "apple", "a@x.com", "apple-sub", {})
+        return user, await _count_accounts(sessions)
+
+    user, count = _run(scenario)
+    assert (user.email, user.name) == ("a@x.com", "Ana")
+    assert count == 1
+
+
+def test_identity_with_changed_email_returns_its_account():
+    async def scenario(sessions):
+        async with sessions() as db:
+            first = await get_or_create_oauth_account(db, "google", "a@x.com", "sub1", {})
+        async with sessions() as db:
+            second = await get_or_create_oauth_account(db, "google", "b@x.com", "sub1", {})
+        return first, second, await _count_accounts(sessions)
+
+    first, second, count = _run(scenario)
+    assert second.id == first.id
+    assert second.email == "a@x.com"
+    assert count == 1
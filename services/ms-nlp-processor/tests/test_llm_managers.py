@@ -1,7 +1,14 @@
 """Unit tests for LangGraphManager helper methods."""
 
+import asyncio
+from typing import Any, TypedDict
+
 import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
 
+from agents.synthesizer_agent import SynthesizerAgent
 from llm_managers import LangGraphManager
 
 
@@ -66,3 +73,77 @@ def test_configuration_router_allows_flow_when_configured(manager, base_state):
     result = manager._configuration_router(state)
 
     assert result == "continue"
+
+
+class _TurnState(TypedDict, total=False):
+    text: str
+    response: Any
+
+
+@pytest.fixture
+def checkpointed_manager(manager):
+    """A manager whose app is a one-node graph backed by a real MemorySaver."""
+    graph = StateGraph(_TurnState)
+    graph.add_node(SynthesizerAgent.AGENT_NAME, lambda state: {"response": AIMessage(content="Oi!")})
+    graph.add_edge(START, SynthesizerAgent.AGENT_NAME)
+    graph.add_edge(SynthesizerAgent.AGENT_NAME, END)
+    manager.app = graph.compile(checkpointer=MemorySaver())
+    manager._initial_state = lambda text, email: {"text": text}
+    return manager
+
+
+def _checkpoints(manager, thread_id):
+    return list(manager.app.checkpointer.list({"configurable": {"thread_id": thread_id}}))
+
+
+def test_process_text_without_history_leaves_no_checkpoint(checkpointed_manager):
+    """history=False turns must not leave their thread in the MemorySaver."""
+    result = asyncio.run(checkpointed_manager.process_text("Olá!", "throwaway", history=False))
+
+    assert result["response"] == "Oi!"
+    assert _checkpoints(checkpointed_manager, "throwaway") == []
+
+
+def test_process_text_with_history_keeps_checkpoint(checkpointed_manager):
+    """By default the thread is kept so the next turn can build on it."""
+    asyncio.run(checkpointed_manager.process_text("Olá!", "kept"))
+
+    assert _checkpoints(checkpointed_manager, "kept") != []
+
+
+def test_stream_text_without_history_leaves_no_checkpoint(checkpointed_manager):
+    """The streaming path forgets the thread too, after its final chunk."""
+    async def collect():
+        return [chunk async for chunk in checkpointed_manager.stream_text("Olá!", "throwaway", history=False)]
+
+    assert "".join(asyncio.run(collect())) == "Oi!"
+    assert _checkpoints(checkpointed_manager, "throwaway") == []
+
+
+class _StreamingApp:
+    """Stands in for the compiled graph, replaying the given "messages" stream."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def astream(self, state, config, stream_mode):
+        for chunk in self.chunks:
+            yield chunk, {"langgraph_node": SynthesizerAgent.AGENT_NAME}
+
+    async def aget_state(self, config):
+        raise AssertionError("streamed turns must not fall back to the final state")
+
+
+def test_stream_text_yields_anthropic_content_blocks(manager):
+    """List content ({"type": "text"} blocks) streams token by token like str content."""
+    manager.app = _StreamingApp([
+        AIMessageChunk(content=[{"type": "text", "text": "Olá", "index": 0}]),
+        AIMessageChunk(content=[{"type": "tool_use", "id": "t1", "name": "x", "input": {}, "index": 1}]),
+        AIMessageChunk(content=[{"type": "text", "text": ", tudo bem?", "index": 0}]),
+    ])
+    manager._initial_state = lambda text, email: {"text": text}
+
+    async def collect():
+        return [chunk async for chunk in manager.stream_text("Oi")]
+
+    assert asyncio.run(collect()) == ["Olá", ", tudo bem?"]
@@ -0,0 +1,111 @@
+"""Unit tests for the /process/async job queue in process_jobs."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from process_jobs import JobQueue, JobQueueFull
+
+
+def test_submit_poll_done():
+    async def main():
+        jobs = JobQueue(max_jobs=4)
+        jobs.start(1)
+        release = asyncio.Event()
+
+        async def run():
+            await release.wait()
+            return {"response": "hi"}
+
+        try:
+            job_id = jobs.submit("user@example.com", run)
+            await asyncio.sleep(0)
+            assert jobs.get(job_id, "user@example.com")["status"] == "pending"
+
+            release.set()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            job = jobs.get(job_id, "user@example.com")
+            assert job["status"] == "done"
+            assert job["result"] == {"response": "hi"}
+        finally:
+            await jobs.stop()
+
+    asyncio.run(main())
+
+
+def test_failed_job_records_error():
+    async def main():
+        jobs = JobQueue(max_jobs=4)
+        jobs.start(1)
+
+        async def run():
+            raise RuntimeError("boom")
+
+        try:
+            job_id = jobs.submit("user@example.com", run)
+            for _ in range(10):
+                await asyncio.sleep(0)
+            job = jobs.get(job_id, "user@example.com")
+            assert job["status"] == "error"
+            assert job["error"] == "boom"
+        finally:
+            await jobs.stop()
+
+    asyncio.run(main())
+
+
+def test_get_hides_other_users_jobs():
+    async def main():
+        jobs = JobQueue(max_jobs=4)
+
+        async def run():
+            return None
+
+        job_id = jobs.submit("user@example.com", run)
+        assert jobs.get(job_id, "other@example.com") is None
+        assert jobs.get("missing", "user@example.com") is None
+
+    asyncio.run(main())
+
+
+def test_full_queue_keeps_pending_jobs():
+    async def main():
+        jobs = JobQueue(max_jobs=2)
+
+        async def run():
+            return None
+
+        first = jobs.submit("user@example.com", run)
+        jobs.submit("user@example.com", run)
+        with pytest.raises(JobQueueFull):
+            jobs.submit("user@example.com", run)
+        assert jobs.get(first, "user@example.com")["status"] == "pending"
+
+    asyncio.run(main())
+
+
+def test_full_queue_evicts_oldest_finished_job():
+    async def main():
+        jobs = JobQueue(max_jobs=2)
+        jobs.start(1)
+
+        async def run():
+            return None
+
+        try:
+            first = jobs.submit("user@example.com", run)
+            second = jobs.submit("user@example.com", run)
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+            third = jobs.submit("user@example.com", run)
+            assert jobs.get(first, "user@example.com") is None
+            assert jobs.get(second, "user@example.com")["status"] == "done"
+            assert jobs.get(third, "user@example.com") is not None
+        finally:
+            await jobs.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""Unit tests for the authentication caches in token_cache."""
+
+from __future__ import annotations
+
+import time
+
+import token_cache
+from token_cache import TTLCache, verify_cached
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    cache = TTLCache(maxsize=4, ttl=5)
+    now = 1000.0
+    monkeypatch.setattr(token_cache.time, "time", lambda: now)
+
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    now += 6
+    assert cache.get("key") is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_verify_cached_reuses_payload_until_token_exp(monkeypatch):
+    monkeypatch.setattr(token_cache, "token_payloads", TTLCache(maxsize=4, ttl=60))
+    calls = []
+
+    def verify(token: str):
+        calls.append(token)
+        return {"email": "user@example.com", "exp": time.time() + 30}
+
+    assert verify_cached("token", verify)["email"] == "user@example.com"
+    assert verify_cached("token", verify)["email"] == "user@example.com"
+    assert calls == ["token"]
+
+
+def test_verify_cached_does_not_cache_failures(monkeypatch):
+    monkeypatch.setattr(token_cache, "token_payloads", TTLCache(maxsize=4, ttl=60))
+    calls = []
+
+    def verify(token: str):
+        calls.append(token)
+        return None
+
+    assert verify_cached("bad", verify) is None
+    assert verify_cached("bad", verify) is None
+    assert calls == ["bad", "bad"]